@@ -0,0 +1,35 @@
+"""Add (sort column, id) indexes for keyset pagination
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Each list endpoint orders by (default sort column, id); a matching
+    # composite index lets a next_cursor seek start mid-index
+    op.create_index('ix_bookings_start_date_id', 'bookings', ['start_date', 'id'], unique=False)
+    op.create_index('ix_sales_sale_date_id', 'sales', ['sale_date', 'id'], unique=False)
+    op.create_index('ix_clients_created_at_id', 'clients', ['created_at', 'id'], unique=False)
+    op.create_index('ix_dresses_created_at_id', 'dresses', ['created_at', 'id'], unique=False)
+    op.create_index('ix_clothing_created_at_id', 'clothing', ['created_at', 'id'], unique=False)
+    op.create_index('ix_notification_logs_sent_at_id', 'notification_logs', ['sent_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_logs_sent_at_id', table_name='notification_logs')
+    op.drop_index('ix_clothing_created_at_id', table_name='clothing')
+    op.drop_index('ix_dresses_created_at_id', table_name='dresses')
+    op.drop_index('ix_clients_created_at_id', table_name='clients')
+    op.drop_index('ix_sales_sale_date_id', table_name='sales')
+    op.drop_index('ix_bookings_start_date_id', table_name='bookings')
@@ -0,0 +1,53 @@
+"""Add daily_revenue rollup table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_revenue',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('rentals', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+        sa.Column('booking_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sales', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+        sa.Column('sales_cost', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+        sa.Column('sale_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('day')
+    )
+    
+    # Backfill from existing bookings and sales
+    op.execute("""
+        INSERT INTO daily_revenue (day, rentals, booking_count, sales, sales_cost, sale_count)
+        SELECT day, sum(rentals), sum(booking_count), sum(sales), sum(sales_cost), sum(sale_count)
+        FROM (
+            SELECT start_date AS day, sum(rental_price) AS rentals, count(id) AS booking_count,
+                   0 AS sales, 0 AS sales_cost, 0 AS sale_count
+            FROM bookings
+            WHERE booking_status != 'cancelled'
+            GROUP BY start_date
+            UNION ALL
+            SELECT s.sale_date, 0, 0, sum(s.total_price),
+                   coalesce(sum(s.quantity * c.purchase_price), 0), count(s.id)
+            FROM sales s JOIN clothing c ON c.id = s.clothing_id
+            GROUP BY s.sale_date
+        ) per_source
+        GROUP BY day
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_revenue')
@@ -0,0 +1,71 @@
+"""Prevent overlapping bookings of a dress with an exclusion constraint
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # btree_gist provides the GiST operator class for plain equality on dress_id
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    
+    # daterange() rejects an end before the start, which would abort the
+    # ALTER below with a bare DataError; name those bookings instead
+    inverted = op.get_bind().execute(sa.text("""
+        SELECT id
+        FROM bookings
+        WHERE start_date > end_date
+          AND booking_status <> 'cancelled'
+        ORDER BY id
+        LIMIT 20
+    """)).scalars().all()
+    if inverted:
+        ids = ", ".join(str(booking_id) for booking_id in inverted)
+        raise RuntimeError(
+            f"Bookings ending before they start must be fixed before this migration (booking ids: {ids})"
+        )
+    
+    # The constraint cannot be added while overlaps exist; name them instead of
+    # failing with a bare constraint error
+    conflicts = op.get_bind().execute(sa.text("""
+        SELECT a.id, b.id
+        FROM bookings a
+        JOIN bookings b
+          ON a.dress_id = b.dress_id
+         AND a.id < b.id
+         AND a.start_date <= b.end_date
+         AND a.end_date >= b.start_date
+        WHERE a.booking_status <> 'cancelled'
+          AND b.booking_status <> 'cancelled'
+        LIMIT 20
+    """)).fetchall()
+    if conflicts:
+        pairs = ", ".join(f"{a}/{b}" for a, b in conflicts)
+        raise RuntimeError(
+            f"Overlapping bookings must be resolved before this migration (booking ids: {pairs})"
+        )
+    
+    op.execute("""
+        ALTER TABLE bookings
+        ADD CONSTRAINT bookings_no_overlap
+        EXCLUDE USING gist (
+            dress_id WITH =,
+            daterange(start_date, end_date, '[]') WITH &&
+        )
+        WHERE (booking_status <> 'cancelled')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS bookings_no_overlap")
@@ -0,0 +1,52 @@
+"""Add foreign key and filter indexes matched to router and report queries
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) - filtered lists order by (date, id), so the filter
+# column leads and the keyset columns follow
+INDEXES = [
+    # Booking list ?client_id= / ?dress_id=, client and dress deletes, top clients
+    ('ix_bookings_client_id_start_date_id', 'bookings', ['client_id', 'start_date', 'id']),
+    ('ix_bookings_dress_id_start_date_id', 'bookings', ['dress_id', 'start_date', 'id']),
+    # Booking list ?status= and the scheduler's confirmed -> in_progress transition
+    ('ix_bookings_booking_status_start_date_id', 'bookings', ['booking_status', 'start_date', 'id']),
+    # Scheduler's in_progress -> completed transition and dashboard upcoming returns
+    ('ix_bookings_booking_status_end_date', 'bookings', ['booking_status', 'end_date']),
+    # Booking list ?deposit_status= and dashboard pending deposits
+    ('ix_bookings_deposit_status_start_date_id', 'bookings', ['deposit_status', 'start_date', 'id']),
+    # Sale list ?client_id= / ?clothing_id=, cascades and top clients
+    ('ix_sales_client_id_sale_date_id', 'sales', ['client_id', 'sale_date', 'id']),
+    ('ix_sales_clothing_id_sale_date_id', 'sales', ['clothing_id', 'sale_date', 'id']),
+    # Image loading per dress / clothing item
+    ('ix_dress_images_dress_id', 'dress_images', ['dress_id']),
+    ('ix_clothing_images_clothing_id', 'clothing_images', ['clothing_id']),
+    # Notification logs ?client_id=, newest first
+    ('ix_notification_logs_client_id_sent_at_id', 'notification_logs', ['client_id', 'sent_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; building this way keeps
+    # the tables writable while the indexes are created
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
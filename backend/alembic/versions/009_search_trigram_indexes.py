@@ -0,0 +1,49 @@
+"""Add pg_trgm GIN indexes for client, dress and clothing search
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, column) searched by the list endpoints' `search` parameter
+INDEXES = [
+    ('ix_clients_full_name_trgm', 'clients', 'full_name'),
+    ('ix_clients_phone_trgm', 'clients', 'phone'),
+    ('ix_clients_whatsapp_trgm', 'clients', 'whatsapp'),
+    ('ix_dresses_name_trgm', 'dresses', 'name'),
+    ('ix_dresses_description_trgm', 'dresses', 'description'),
+    ('ix_clothing_name_trgm', 'clothing', 'name'),
+    ('ix_clothing_description_trgm', 'clothing', 'description'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    # Trigram GIN indexes serve ILIKE '%term%', ILIKE 'term%' and the
+    # word-similarity operators used for fuzzy matching and ranking
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
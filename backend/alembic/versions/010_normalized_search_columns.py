@@ -0,0 +1,108 @@
+"""Add normalized search shadow columns for client, dress and clothing names
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import re
+import unicodedata
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app.utils.text.normalize_text as of this revision, so
+# replaying the migration writes what existing databases already hold.
+# Later changes to the normalizer need a migration of their own.
+_FOLD = str.maketrans({
+    "\u0640": None,      # tatweel
+    "\u0671": "\u0627",  # alef wasla -> alef
+    "\u0649": "\u064a",  # alef maqsura -> yeh
+    "\u0629": "\u0647",  # teh marbuta -> heh
+    "\u06cc": "\u064a",  # farsi yeh -> yeh
+    "\u06a9": "\u0643",  # keheh -> kaf
+    "\u0153": "oe",
+    "\u00e6": "ae",
+    **{chr(0x0660 + d): str(d) for d in range(10)},  # Arabic-Indic digits
+    **{chr(0x06f0 + d): str(d) for d in range(10)},  # Extended Arabic-Indic digits
+})
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(value):
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", stripped.casefold().translate(_FOLD)).strip()
+
+# (table, source column, shadow column, old raw trigram index)
+SHADOWS = [
+    ('clients', 'full_name', 'full_name_normalized', 'ix_clients_full_name_trgm'),
+    ('dresses', 'name', 'name_normalized', 'ix_dresses_name_trgm'),
+    ('clothing', 'name', 'name_normalized', 'ix_clothing_name_trgm'),
+]
+
+
+def _backfill(bind, table: str, source: str, shadow: str):
+    """Fill the shadow column with the normalizer the application used at this revision"""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(f"SELECT id, {source} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {shadow} = :value WHERE id = :id"),
+            [{"id": row_id, "value": normalize_text(value)} for row_id, value in rows]
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, source, shadow, _ in SHADOWS:
+        op.add_column(table, sa.Column(shadow, sa.String(length=255), nullable=True))
+        _backfill(bind, table, source, shadow)
+        op.alter_column(table, shadow, nullable=False)
+    
+    # Name searches now go through the shadow columns, so move the trigram
+    # indexes over; built after the backfill and outside the transaction
+    with op.get_context().autocommit_block():
+        for table, _, shadow, old_index in SHADOWS:
+            op.create_index(
+                f'ix_{table}_{shadow}_trgm', table, [shadow], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={shadow: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+            op.drop_index(old_index, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, source, shadow, old_index in reversed(SHADOWS):
+            op.create_index(
+                old_index, table, [source], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={source: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+            op.drop_index(f'ix_{table}_{shadow}_trgm', table_name=table, postgresql_concurrently=True, if_exists=True)
+    
+    for table, _, shadow, _ in reversed(SHADOWS):
+        op.drop_column(table, shadow)
@@ -0,0 +1,96 @@
+"""Add E.164-normalized client phone columns with lookup indexes
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import os
+import re
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app.utils.phone.normalize_phone as of this revision, so
+# replaying the migration writes what existing databases already hold.
+# The default country still follows the PHONE_COUNTRY_CODE setting.
+COUNTRY_CODE = os.environ.get("PHONE_COUNTRY_CODE", "213")
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(value):
+    if not value:
+        return None
+
+    raw = value.strip()
+    if raw.lower().startswith("whatsapp:"):
+        raw = raw[len("whatsapp:"):].strip()
+    digits = _NON_DIGITS.sub("", raw)
+    if not digits:
+        return None
+
+    if raw.startswith("+"):
+        number = digits
+    elif digits.startswith("00"):
+        number = digits[2:]
+    elif digits.startswith("0"):
+        number = COUNTRY_CODE + digits[1:]
+    elif digits.startswith(COUNTRY_CODE) and len(digits) >= len(COUNTRY_CODE) + 8:
+        number = digits
+    else:
+        number = COUNTRY_CODE + digits
+
+    if len(number) > 15 or len(number) < 8:
+        return None
+    return f"+{number}"
+
+
+def upgrade() -> None:
+    op.add_column('clients', sa.Column('phone_e164', sa.String(length=16), nullable=True))
+    op.add_column('clients', sa.Column('whatsapp_e164', sa.String(length=16), nullable=True))
+    
+    # Backfill with the normalizer the application applied on write at this revision
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("""
+                SELECT id, phone, whatsapp FROM clients
+                WHERE id > :last_id AND (phone IS NOT NULL OR whatsapp IS NOT NULL)
+                ORDER BY id LIMIT :limit
+            """),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE clients SET phone_e164 = :phone, whatsapp_e164 = :whatsapp WHERE id = :id"),
+            [
+                {"id": row_id, "phone": normalize_phone(phone), "whatsapp": normalize_phone(whatsapp)}
+                for row_id, phone, whatsapp in rows
+            ]
+        )
+        last_id = rows[-1][0]
+    
+    # Not unique: relatives often share a number
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clients_phone_e164', 'clients', ['phone_e164'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_clients_whatsapp_e164', 'clients', ['whatsapp_e164'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clients_whatsapp_e164', table_name='clients', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_clients_phone_e164', table_name='clients', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('clients', 'whatsapp_e164')
+    op.drop_column('clients', 'phone_e164')
@@ -0,0 +1,38 @@
+"""Add byte-order prefix indexes for client suggestions
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # COLLATE "C" lets LIKE 'prefix%' become an index range scan and returns
+    # rows in the ORDER BY of /api/clients/suggest, so no sort is needed
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_clients_full_name_normalized_prefix', 'clients',
+            [sa.text('full_name_normalized COLLATE "C"')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_clients_phone_e164_prefix', 'clients',
+            [sa.text('phone_e164 COLLATE "C"')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clients_phone_e164_prefix', table_name='clients', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_clients_full_name_normalized_prefix', table_name='clients', postgresql_concurrently=True, if_exists=True)
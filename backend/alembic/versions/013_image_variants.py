@@ -0,0 +1,29 @@
+"""Add generated image variants to dress and clothing images
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without a default: adding it does not rewrite the tables.
+    # Existing images are filled by `python -m app.services.images backfill`
+    op.add_column('dress_images', sa.Column('variants', postgresql.JSONB(), nullable=True))
+    op.add_column('clothing_images', sa.Column('variants', postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('clothing_images', 'variants')
+    op.drop_column('dress_images', 'variants')
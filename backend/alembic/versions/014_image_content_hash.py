@@ -0,0 +1,42 @@
+"""Add content hashes to dress and clothing images
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL marks images stored under uuid names before content addressing;
+    # `python -m app.services.images backfill` moves them into uploads/objects/
+    op.add_column('dress_images', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('clothing_images', sa.Column('content_hash', sa.String(64), nullable=True))
+
+    # Reference counts on delete look rows up by hash
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_dress_images_content_hash', 'dress_images', ['content_hash'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_clothing_images_content_hash', 'clothing_images', ['content_hash'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clothing_images_content_hash', table_name='clothing_images', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_dress_images_content_hash', table_name='dress_images', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('clothing_images', 'content_hash')
+    op.drop_column('dress_images', 'content_hash')
@@ -8,8 +8,8 @@ settings = get_settings()
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,15 +1,17 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
+import anyio.to_thread
 import os
 
 from .config import get_settings
 from .database import engine, Base
-from .routers import auth, clients, dresses, clothing, bookings, sales, reports, export, notifications
+from .routers import auth, clients, dresses, clothing, bookings, sales, reports, export, notifications, search
 from .routers import settings as settings_router
-from .services.scheduler import start_scheduler, stop_scheduler
+from .services.scheduler import start_scheduler, stop_scheduler, last_run as scheduler_last_run
+from .services.availability import availability_index
+from .utils.static import UploadStaticFiles
 
 settings = get_settings()
 
@@ -33,6 +35,14 @@ async def lifespan(app: FastAPI):
     os.makedirs(f"{settings.upload_dir}/dresses", exist_ok=True)
     os.makedirs(f"{settings.upload_dir}/clothing", exist_ok=True)
     os.makedirs(f"{settings.upload_dir}/logos", exist_ok=True)
+    os.makedirs(f"{settings.upload_dir}/objects", exist_ok=True)
+    
+    # Route handlers are plain `def` and run in the threadpool, so size it to
+    # the DB pool: a slow report only occupies one worker thread, never the loop
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    
+    # Build the in-memory booking intervals; lookups use the DB until it is ready
+    availability_index.reload_async()
     
     # Start the scheduler for automatic booking status updates
     start_scheduler()
@@ -68,8 +78,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for uploads
-app.mount("/uploads", StaticFiles(directory=settings.upload_dir), name="uploads")
+# Mount static files for uploads (bytes sent by nginx when uploads_accel_redirect is on)
+app.mount("/uploads", UploadStaticFiles(directory=settings.upload_dir), name="uploads")
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -81,6 +91,7 @@ app.include_router(sales.router, prefix="/api/sales", tags=["Sales"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
 app.include_router(export.router, prefix="/api/export", tags=["Export/Import"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["Notifications"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(settings_router.router, prefix="/api/settings", tags=["Settings"])
 
 
@@ -97,5 +108,9 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "app": settings.app_name}
+    return {
+        "status": "healthy",
+        "app": settings.app_name,
+        "booking_status_update": scheduler_last_run
+    }
 
@@ -6,6 +6,7 @@ from .booking import Booking
 from .sale import Sale
 from .notification import NotificationLog
 from .settings import Settings
+from .revenue import DailyRevenue
 
 __all__ = [
     "Admin",
@@ -17,6 +18,7 @@ __all__ = [
     "Booking",
     "Sale",
     "NotificationLog",
-    "Settings"
+    "Settings",
+    "DailyRevenue"
 ]
 
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Date, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,6 +7,22 @@ from ..database import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_start_date_id", "start_date", "id"),
+        Index("ix_bookings_client_id_start_date_id", "client_id", "start_date", "id"),
+        Index("ix_bookings_dress_id_start_date_id", "dress_id", "start_date", "id"),
+        Index("ix_bookings_booking_status_start_date_id", "booking_status", "start_date", "id"),
+        Index("ix_bookings_booking_status_end_date", "booking_status", "end_date"),
+        Index("ix_bookings_deposit_status_start_date_id", "deposit_status", "start_date", "id"),
+        # No two non-cancelled bookings of a dress may share a day (requires btree_gist)
+        ExcludeConstraint(
+            ("dress_id", "="),
+            (text("daterange(start_date, end_date, '[]')"), "&&"),
+            name="bookings_no_overlap",
+            using="gist",
+            where=text("booking_status <> 'cancelled'")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
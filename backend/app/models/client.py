@@ -1,16 +1,33 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, text
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from ..database import Base
+from ..utils.phone import normalize_phone
+from ..utils.text import normalize_text
 
 
 class Client(Base):
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("ix_clients_created_at_id", "created_at", "id"),
+        # Trigram indexes for search (requires pg_trgm)
+        Index("ix_clients_full_name_normalized_trgm", "full_name_normalized", postgresql_using="gin", postgresql_ops={"full_name_normalized": "gin_trgm_ops"}),
+        Index("ix_clients_phone_trgm", "phone", postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}),
+        Index("ix_clients_whatsapp_trgm", "whatsapp", postgresql_using="gin", postgresql_ops={"whatsapp": "gin_trgm_ops"}),
+        Index("ix_clients_phone_e164", "phone_e164"),
+        Index("ix_clients_whatsapp_e164", "whatsapp_e164"),
+        # Byte-order indexes for prefix suggestions: LIKE 'x%' plus ORDER BY in one range scan
+        Index("ix_clients_full_name_normalized_prefix", text('full_name_normalized COLLATE "C"')),
+        Index("ix_clients_phone_e164_prefix", text('phone_e164 COLLATE "C"')),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String(255), nullable=False, index=True)
+    full_name_normalized = Column(String(255), nullable=False)  # search shadow of full_name, see normalize_text
     phone = Column(String(50), nullable=True)
     whatsapp = Column(String(50), nullable=True)
+    phone_e164 = Column(String(16), nullable=True)  # normalized phone, see normalize_phone
+    whatsapp_e164 = Column(String(16), nullable=True)  # normalized whatsapp
     address = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,3 +38,13 @@ class Client(Base):
     sales = relationship("Sale", back_populates="client", cascade="all, delete-orphan")
     notifications = relationship("NotificationLog", back_populates="client", cascade="all, delete-orphan")
 
+    @validates("full_name")
+    def _normalize_full_name(self, key, value):
+        self.full_name_normalized = normalize_text(value)
+        return value
+
+    @validates("phone", "whatsapp")
+    def _normalize_phone(self, key, value):
+        setattr(self, f"{key}_e164", normalize_phone(value))
+        return value
+
@@ -1,14 +1,24 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import column_property, relationship, validates
 from sqlalchemy.sql import func
 from ..database import Base
+from ..utils.images import primary_image_path
+from ..utils.text import normalize_text
 
 
 class Dress(Base):
     __tablename__ = "dresses"
+    __table_args__ = (
+        Index("ix_dresses_created_at_id", "created_at", "id"),
+        # Trigram indexes for search (requires pg_trgm)
+        Index("ix_dresses_name_normalized_trgm", "name_normalized", postgresql_using="gin", postgresql_ops={"name_normalized": "gin_trgm_ops"}),
+        Index("ix_dresses_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
+    name_normalized = Column(String(255), nullable=False)  # search shadow of name, see normalize_text
     category = Column(String(100), nullable=False)  # e.g., "Wedding", "Evening", "Engagement"
     size = Column(String(50), nullable=False)
     color = Column(String(100), nullable=False)
@@ -23,15 +33,33 @@ class Dress(Base):
     images = relationship("DressImage", back_populates="dress", cascade="all, delete-orphan")
     bookings = relationship("Booking", back_populates="dress", cascade="all, delete-orphan")
 
+    @validates("name")
+    def _normalize_name(self, key, value):
+        self.name_normalized = normalize_text(value)
+        return value
+
 
 class DressImage(Base):
     __tablename__ = "dress_images"
 
     id = Column(Integer, primary_key=True, index=True)
-    dress_id = Column(Integer, ForeignKey("dresses.id", ondelete="CASCADE"), nullable=False)
+    dress_id = Column(Integer, ForeignKey("dresses.id", ondelete="CASCADE"), nullable=False, index=True)
     image_path = Column(String(500), nullable=False)
+    # {"thumb"|"medium"|"full": {"webp", "jpeg", "width", "height"}}, see services/images.py
+    variants = Column(JSONB, nullable=True)
+    # SHA-256 of the original; rows sharing it share the files under uploads/objects/
+    content_hash = Column(String(64), nullable=True, index=True)
     is_primary = Column(Boolean, default=False)
 
     # Relationships
     dress = relationship("Dress", back_populates="images")
 
+
+# Primary image (and its thumbnail) for list views; deferred so it is only selected when undeferred
+Dress.primary_image_path = column_property(
+    primary_image_path(DressImage, DressImage.dress_id, Dress.id), deferred=True
+)
+Dress.primary_thumbnail_path = column_property(
+    primary_image_path(DressImage, DressImage.dress_id, Dress.id, variant="thumb"), deferred=True
+)
+
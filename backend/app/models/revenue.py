@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class DailyRevenue(Base):
+    """Per-day revenue rollup of non-cancelled bookings (by start_date) and sales (by sale_date)"""
+    __tablename__ = "daily_revenue"
+
+    day = Column(Date, primary_key=True)
+    rentals = Column(Numeric(12, 2), nullable=False, default=0)
+    booking_count = Column(Integer, nullable=False, default=0)
+    sales = Column(Numeric(12, 2), nullable=False, default=0)
+    sales_cost = Column(Numeric(12, 2), nullable=False, default=0)
+    sale_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
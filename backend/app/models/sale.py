@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,6 +6,11 @@ from ..database import Base
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_sale_date_id", "sale_date", "id"),
+        Index("ix_sales_client_id_sale_date_id", "client_id", "sale_date", "id"),
+        Index("ix_sales_clothing_id_sale_date_id", "clothing_id", "sale_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
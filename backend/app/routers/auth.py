@@ -8,6 +8,7 @@ from passlib.context import CryptContext
 from ..database import get_db
 from ..config import get_settings
 from ..models.admin import Admin
+from ..utils.cache import TTLCache
 from ..schemas.auth import Token, TokenData, AdminCreate, AdminResponse, LoginRequest
 
 router = APIRouter()
@@ -16,6 +17,9 @@ settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Authenticated admins keyed by token subject (email), detached from their session
+principal_cache = TTLCache(maxsize=settings.auth_cache_size, ttl=settings.auth_cache_ttl)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -36,7 +40,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     return encoded_jwt
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> Admin:
@@ -54,14 +58,20 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
+    user = principal_cache.get(token_data.email)
+    if user is not None:
+        return user
+    
     user = db.query(Admin).filter(Admin.email == token_data.email).first()
     if user is None:
         raise credentials_exception
+    db.expunge(user)
+    principal_cache.set(token_data.email, user)
     return user
 
 
 @router.post("/login", response_model=Token)
-async def login(
+def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -82,7 +92,7 @@ async def login(
 
 
 @router.post("/register", response_model=AdminResponse)
-async def register(admin: AdminCreate, db: Session = Depends(get_db)):
+def register(admin: AdminCreate, db: Session = Depends(get_db)):
     """Register a new admin user (first-time setup only)"""
     # Check if any admin exists
     existing_admin = db.query(Admin).first()
@@ -113,21 +123,32 @@ async def register(admin: AdminCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=AdminResponse)
-async def get_current_admin(current_user: Admin = Depends(get_current_user)):
+def get_current_admin(current_user: Admin = Depends(get_current_user)):
     """Get current logged-in admin"""
     return current_user
 
 
 @router.put("/me", response_model=AdminResponse)
-async def update_admin(
+def update_admin(
     name: str = None,
     current_user: Admin = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update admin profile"""
+    # current_user may come from the principal cache, so load a session-bound copy
+    admin = db.query(Admin).filter(Admin.id == current_user.id).first()
+    if admin is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
     if name:
-        current_user.name = name
+        admin.name = name
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    db.refresh(admin)
+    principal_cache.invalidate(current_user.email)
+    return admin
+
+
+@router.get("/cache-stats")
+def get_principal_cache_stats(current_user: Admin = Depends(get_current_user)):
+    """Get hit/miss counters for the authenticated principal cache"""
+    return principal_cache.stats()
 
@@ -1,20 +1,90 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, asc, desc
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Literal
 from datetime import date, datetime
 
 from ..database import get_db
 from ..models.booking import Booking
+from ..models.client import Client
 from ..models.dress import Dress, DressImage
-from ..schemas.booking import BookingCreate, BookingUpdate, BookingResponse, BookingListResponse, CalendarBooking
+from ..schemas.booking import (
+    BookingCreate, BookingUpdate, BookingResponse, BookingListResponse, CalendarBooking, CompactCalendarResponse
+)
+from ..services.availability import availability_index
+from ..services.dashboard import invalidate_dashboard
+from ..services.revenue import booking_days, refresh_revenue_days
+from ..utils.images import ListView, primary_image_path
+from ..utils.pagination import CountMode, paginate, sort_column_for
 from .auth import get_current_user
 
 router = APIRouter()
 
+# Calendar event colour per booking status
+STATUS_COLORS = {
+    "confirmed": "#10b981",  # green
+    "in_progress": "#f59e0b",  # amber
+    "completed": "#6366f1",  # indigo
+}
+DEFAULT_STATUS_COLOR = "#94a3b8"
+
+# Name of the exclusion constraint on (dress_id, daterange(start_date, end_date, '[]'))
+BOOKING_OVERLAP_CONSTRAINT = "bookings_no_overlap"
+
+
+def flush_booking(db: Session, dress_id: int, start: date, end: date, exclude_id: Optional[int] = None):
+    """Flush pending booking changes, turning an overlap violation into a 400"""
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        constraint = getattr(getattr(e.orig, "diag", None), "constraint_name", None)
+        if constraint != BOOKING_OVERLAP_CONSTRAINT:
+            raise
+        
+        # Only on conflict: look up the booking we collided with for the message
+        conflict = availability_index.find_conflict(dress_id, start, end, exclude_id)
+        if conflict:
+            raise HTTPException(status_code=400, detail=f"Dress is already booked from {conflict[0]} to {conflict[1]}")
+        
+        query = db.query(Booking).filter(
+            and_(
+                Booking.dress_id == dress_id,
+                Booking.booking_status != "cancelled",
+                Booking.start_date <= end,
+                Booking.end_date >= start
+            )
+        )
+        if exclude_id:
+            query = query.filter(Booking.id != exclude_id)
+        overlapping = query.first()
+        
+        if overlapping:
+            detail = f"Dress is already booked from {overlapping.start_date} to {overlapping.end_date}"
+        else:
+            detail = "Dress is already booked for these dates"
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def calendar_filter(query, start: date, end: date, dress_id: Optional[int] = None):
+    """Restrict a bookings query to non-cancelled bookings overlapping [start, end]"""
+    # Always SQL: a month or year of bookings as an id IN list is slower than
+    # the indexed range predicate it would replace
+    query = query.filter(
+        and_(
+            Booking.start_date <= end,
+            Booking.end_date >= start,
+            Booking.booking_status != "cancelled"
+        )
+    )
+    if dress_id:
+        query = query.filter(Booking.dress_id == dress_id)
+    return query
+
 
 @router.get("/", response_model=BookingListResponse)
-async def get_bookings(
+def get_bookings(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     status: Optional[str] = None,
@@ -25,13 +95,19 @@ async def get_bookings(
     end_date: Optional[date] = None,
     sort_by: Optional[str] = Query("start_date", description="Field to sort by: start_date, rental_price, created_at"),
     sort_order: Optional[Literal["asc", "desc"]] = Query("desc", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; seeks instead of skipping"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
+    view: ListView = Query("full", description="full: every image; list: primary image and thumbnail paths only, images null"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all bookings with optional filters, sorting, and pagination"""
+    # Images load in a separate IN query (full view) rather than multiplying
+    # the joined booking rows, or not at all (list view)
+    dress = joinedload(Booking.dress).undefer(Dress.primary_image_path).undefer(Dress.primary_thumbnail_path)
     query = db.query(Booking).options(
         joinedload(Booking.client),
-        joinedload(Booking.dress).joinedload(Dress.images)
+        dress.selectinload(Dress.images) if view == "full" else dress.raiseload(Dress.images)
     )
     
     if status:
@@ -52,22 +128,17 @@ async def get_bookings(
     if end_date:
         query = query.filter(Booking.end_date <= end_date)
     
-    total = query.count()
-    
-    # Apply sorting
-    sort_column = getattr(Booking, sort_by, Booking.start_date)
-    if sort_order == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        query = query.order_by(desc(sort_column))
-    
-    bookings = query.offset(skip).limit(limit).all()
+    # Apply sorting and offset or keyset pagination
+    sort_column = sort_column_for(Booking, sort_by, Booking.start_date)
+    bookings, total, next_cursor = paginate(
+        db, query, sort_column, Booking.id, sort_order, skip, limit, cursor, count
+    )
     
-    return {"bookings": bookings, "total": total}
+    return {"bookings": bookings, "total": total, "next_cursor": next_cursor}
 
 
 @router.get("/calendar", response_model=List[CalendarBooking])
-async def get_calendar_bookings(
+def get_calendar_bookings(
     start: date,
     end: date,
     dress_id: Optional[int] = None,
@@ -75,30 +146,17 @@ async def get_calendar_bookings(
     current_user = Depends(get_current_user)
 ):
     """Get bookings for calendar view within a date range"""
-    query = db.query(Booking).options(
+    query = calendar_filter(db.query(Booking).options(
         joinedload(Booking.client),
         joinedload(Booking.dress).joinedload(Dress.images)
-    ).filter(
-        and_(
-            Booking.start_date <= end,
-            Booking.end_date >= start,
-            Booking.booking_status != "cancelled"
-        )
-    )
-    
-    if dress_id:
-        query = query.filter(Booking.dress_id == dress_id)
+    ), start, end, dress_id)
     
     bookings = query.all()
     
     # Transform to calendar format
     calendar_events = []
     for booking in bookings:
-        color = {
-            "confirmed": "#10b981",  # green
-            "in_progress": "#f59e0b",  # amber
-            "completed": "#6366f1",  # indigo
-        }.get(booking.booking_status, "#94a3b8")
+        color = STATUS_COLORS.get(booking.booking_status, DEFAULT_STATUS_COLOR)
         
         calendar_events.append({
             "id": booking.id,
@@ -110,7 +168,7 @@ async def get_calendar_bookings(
             "client_name": booking.client.full_name,
             "dress_name": booking.dress.name,
             "dress_images": [
-                {"id": img.id, "image_path": img.image_path, "is_primary": img.is_primary}
+                {"id": img.id, "image_path": img.image_path, "variants": img.variants, "is_primary": img.is_primary}
                 for img in booking.dress.images
             ]
         })
@@ -118,8 +176,66 @@ async def get_calendar_bookings(
     return calendar_events
 
 
+@router.get("/calendar/compact", response_model=CompactCalendarResponse)
+def get_compact_calendar(
+    start: date,
+    end: date,
+    dress_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get calendar events referencing dresses and clients by id, with one lookup table of each"""
+    events = calendar_filter(db.query(
+        Booking.id, Booking.dress_id, Booking.client_id,
+        Booking.start_date, Booking.end_date, Booking.booking_status
+    ), start, end, dress_id).all()
+    
+    dress_ids = sorted({event.dress_id for event in events})
+    client_ids = sorted({event.client_id for event in events})
+    
+    # Column projections: one row per dress / client, primary image thumbnail only
+    dresses = db.query(
+        Dress.id, Dress.name,
+        primary_image_path(DressImage, DressImage.dress_id, Dress.id, variant="thumb").label("image_path")
+    ).filter(Dress.id.in_(dress_ids)).all() if dress_ids else []
+    
+    clients = db.query(Client.id, Client.full_name).filter(
+        Client.id.in_(client_ids)
+    ).all() if client_ids else []
+    
+    return {
+        "events": [
+            {
+                "id": event.id,
+                "dress_id": event.dress_id,
+                "client_id": event.client_id,
+                "start": event.start_date.isoformat(),
+                "end": event.end_date.isoformat(),
+                "color": STATUS_COLORS.get(event.booking_status, DEFAULT_STATUS_COLOR),
+                "status": event.booking_status
+            }
+            for event in events
+        ],
+        "dresses": [row._asdict() for row in dresses],
+        "clients": [row._asdict() for row in clients]
+    }
+
+
+@router.get("/availability-index")
+def get_availability_index(
+    verify: bool = Query(False, description="Compare the in-memory index with the bookings table"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get in-memory availability index status, optionally checking it against the DB"""
+    result = {"index": availability_index.stats()}
+    if verify:
+        result["verify"] = availability_index.verify(db)
+    return result
+
+
 @router.get("/{booking_id}", response_model=BookingResponse)
-async def get_booking(
+def get_booking(
     booking_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -136,7 +252,7 @@ async def get_booking(
 
 
 @router.post("/", response_model=BookingResponse)
-async def create_booking(
+def create_booking(
     booking: BookingCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -147,21 +263,10 @@ async def create_booking(
     if not dress:
         raise HTTPException(status_code=404, detail="Dress not found")
     
-    # Check for overlapping bookings
-    overlapping = db.query(Booking).filter(
-        and_(
-            Booking.dress_id == booking.dress_id,
-            Booking.booking_status != "cancelled",
-            Booking.start_date <= booking.end_date,
-            Booking.end_date >= booking.start_date
-        )
-    ).first()
-    
-    if overlapping:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Dress is already booked from {overlapping.start_date} to {overlapping.end_date}"
-        )
+    # Known conflicts are rejected from memory without attempting the insert
+    conflict = availability_index.find_conflict(booking.dress_id, booking.start_date, booking.end_date)
+    if conflict:
+        raise HTTPException(status_code=400, detail=f"Dress is already booked from {conflict[0]} to {conflict[1]}")
     
     db_booking = Booking(
         client_id=booking.client_id,
@@ -176,12 +281,20 @@ async def create_booking(
     )
     db.add(db_booking)
     
+    # The bookings_no_overlap constraint rejects double bookings on insert
+    flush_booking(db, booking.dress_id, booking.start_date, booking.end_date)
+    
     # Update dress status if booking starts today or earlier
     if booking.start_date <= date.today():
         dress.status = "rented"
     
+    refresh_revenue_days(db, [booking.start_date])
     db.commit()
+    invalidate_dashboard()
     db.refresh(db_booking)
+    availability_index.upsert(
+        db_booking.id, db_booking.dress_id, db_booking.start_date, db_booking.end_date, db_booking.booking_status
+    )
     
     # Reload with relationships
     return db.query(Booking).options(
@@ -191,7 +304,7 @@ async def create_booking(
 
 
 @router.put("/{booking_id}", response_model=BookingResponse)
-async def update_booking(
+def update_booking(
     booking_id: int,
     booking: BookingUpdate,
     db: Session = Depends(get_db),
@@ -203,31 +316,20 @@ async def update_booking(
         raise HTTPException(status_code=404, detail="Booking not found")
     
     update_data = booking.model_dump(exclude_unset=True)
-    
-    # If changing dates, check for conflicts
-    if "start_date" in update_data or "end_date" in update_data:
-        new_start = update_data.get("start_date", db_booking.start_date)
-        new_end = update_data.get("end_date", db_booking.end_date)
-        
-        overlapping = db.query(Booking).filter(
-            and_(
-                Booking.dress_id == db_booking.dress_id,
-                Booking.id != booking_id,
-                Booking.booking_status != "cancelled",
-                Booking.start_date <= new_end,
-                Booking.end_date >= new_start
-            )
-        ).first()
-        
-        if overlapping:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Dress is already booked from {overlapping.start_date} to {overlapping.end_date}"
-            )
+    previous_start = db_booking.start_date
     
     for field, value in update_data.items():
         setattr(db_booking, field, value)
     
+    # Only one of the dates may have changed; an inverted range would fail the
+    # constraint's daterange() with a DataError rather than an IntegrityError
+    if db_booking.end_date < db_booking.start_date:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="End date must be on or after start date")
+    
+    # Date or status changes that would double-book the dress fail here
+    flush_booking(db, db_booking.dress_id, db_booking.start_date, db_booking.end_date, exclude_id=booking_id)
+    
     # Update dress status based on booking status
     dress = db.query(Dress).filter(Dress.id == db_booking.dress_id).first()
     if db_booking.booking_status == "completed" or db_booking.booking_status == "cancelled":
@@ -247,8 +349,13 @@ async def update_booking(
     elif db_booking.booking_status == "in_progress":
         dress.status = "rented"
     
+    refresh_revenue_days(db, [previous_start, db_booking.start_date])
     db.commit()
+    invalidate_dashboard()
     db.refresh(db_booking)
+    availability_index.upsert(
+        db_booking.id, db_booking.dress_id, db_booking.start_date, db_booking.end_date, db_booking.booking_status
+    )
     
     return db.query(Booking).options(
         joinedload(Booking.client),
@@ -257,7 +364,7 @@ async def update_booking(
 
 
 @router.delete("/{booking_id}")
-async def delete_booking(
+def delete_booking(
     booking_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -268,18 +375,25 @@ async def delete_booking(
         raise HTTPException(status_code=404, detail="Booking not found")
     
     db.delete(booking)
+    refresh_revenue_days(db, [booking.start_date])
     db.commit()
+    invalidate_dashboard()
+    availability_index.remove([booking_id])
     return {"message": "Booking deleted successfully"}
 
 
 @router.post("/bulk-delete")
-async def bulk_delete_bookings(
+def bulk_delete_bookings(
     ids: list[int],
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Delete multiple bookings by IDs"""
+    days = booking_days(db, Booking.id.in_(ids))
     deleted_count = db.query(Booking).filter(Booking.id.in_(ids)).delete(synchronize_session=False)
+    refresh_revenue_days(db, days)
     db.commit()
+    invalidate_dashboard()
+    availability_index.remove(ids)
     return {"message": f"{deleted_count} bookings deleted successfully", "deleted_count": deleted_count}
 
@@ -1,55 +1,113 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc, desc
+from sqlalchemy import or_
 from typing import List, Optional, Literal
 
 from ..database import get_db
 from ..models.client import Client
-from ..schemas.client import ClientCreate, ClientUpdate, ClientResponse, ClientListResponse
+from ..models.booking import Booking
+from ..models.sale import Sale
+from ..schemas.client import ClientCreate, ClientUpdate, ClientResponse, ClientListResponse, ClientSuggestion
+from ..services.availability import availability_index
+from ..services.dashboard import invalidate_dashboard
+from ..services.revenue import booking_days, sale_days, refresh_revenue_days
+from ..utils.pagination import CountMode, paginate, paginate_ranked, sort_column_for
+from ..utils.phone import normalize_phone
+from ..utils.search import MatchMode, escape_like, text_search
+from ..utils.text import normalize_text
 from .auth import get_current_user
 
 router = APIRouter()
 
 
 @router.get("/", response_model=ClientListResponse)
-async def get_clients(
+def get_clients(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     search: Optional[str] = None,
-    sort_by: Optional[str] = Query("created_at", description="Field to sort by: full_name, created_at"),
+    match: MatchMode = Query("contains", description="How search matches: contains, prefix or fuzzy"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by: full_name, created_at, relevance (default: created_at, or relevance for fuzzy search)"),
     sort_order: Optional[Literal["asc", "desc"]] = Query("desc", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; seeks instead of skipping"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all clients with optional search, sorting, and pagination"""
     query = db.query(Client)
     
+    rank = None
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                Client.full_name.ilike(search_filter),
-                Client.phone.ilike(search_filter),
-                Client.whatsapp.ilike(search_filter)
-            )
+        search_filter, rank = text_search(search, [Client.full_name_normalized], [Client.phone, Client.whatsapp], match)
+        query = query.filter(search_filter)
+    
+    # Best matches first when asked for, or by default for fuzzy search
+    if rank is not None and (sort_by == "relevance" or (sort_by is None and match == "fuzzy")):
+        clients, total, next_cursor = paginate_ranked(
+            db, query, rank, Client.id, skip, limit, count
         )
+        return {"clients": clients, "total": total, "next_cursor": next_cursor}
     
-    total = query.count()
+    # Apply sorting and offset or keyset pagination
+    sort_column = sort_column_for(Client, sort_by, Client.created_at)
+    clients, total, next_cursor = paginate(
+        db, query, sort_column, Client.id, sort_order, skip, limit, cursor, count
+    )
     
-    # Apply sorting
-    sort_column = getattr(Client, sort_by, Client.created_at)
-    if sort_order == "asc":
-        query = query.order_by(asc(sort_column))
+    return {"clients": clients, "total": total, "next_cursor": next_cursor}
+
+
+@router.get("/suggest", response_model=List[ClientSuggestion])
+def suggest_clients(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Suggest clients whose name (or phone, for digits) starts with prefix"""
+    # Digits are a phone prefix: "0555" -> "+213555"
+    if prefix.strip().lstrip("+").replace(" ", "").isdigit():
+        key = Client.phone_e164.collate("C")
+        term = normalize_phone(prefix, partial=True)
     else:
-        query = query.order_by(desc(sort_column))
+        key = Client.full_name_normalized.collate("C")
+        term = normalize_text(prefix)
     
-    clients = query.offset(skip).limit(limit).all()
+    if not term:
+        return []
     
-    return {"clients": clients, "total": total}
+    # Range scan on the COLLATE "C" prefix index, already in output order
+    return db.query(Client.id, Client.full_name, Client.phone).filter(
+        key.like(f"{escape_like(term)}%", escape="\\")
+    ).order_by(key, Client.id).limit(limit).all()
+
+
+@router.get("/by-phone/{number}", response_model=ClientResponse)
+def get_client_by_phone(
+    number: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Find the client with a phone or WhatsApp number, in any common format"""
+    normalized = normalize_phone(number)
+    if not normalized:
+        raise HTTPException(status_code=400, detail="Invalid phone number")
+    
+    # Equality probes on the E.164 indexes; the newest client wins if shared
+    client = db.query(Client).filter(
+        or_(
+            Client.phone_e164 == normalized,
+            Client.whatsapp_e164 == normalized
+        )
+    ).order_by(Client.id.desc()).first()
+    
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return client
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
-async def get_client(
+def get_client(
     client_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -62,7 +120,7 @@ async def get_client(
 
 
 @router.post("/", response_model=ClientResponse)
-async def create_client(
+def create_client(
     client: ClientCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -71,12 +129,13 @@ async def create_client(
     db_client = Client(**client.model_dump())
     db.add(db_client)
     db.commit()
+    invalidate_dashboard()
     db.refresh(db_client)
     return db_client
 
 
 @router.put("/{client_id}", response_model=ClientResponse)
-async def update_client(
+def update_client(
     client_id: int,
     client: ClientUpdate,
     db: Session = Depends(get_db),
@@ -97,7 +156,7 @@ async def update_client(
 
 
 @router.delete("/{client_id}")
-async def delete_client(
+def delete_client(
     client_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -107,19 +166,27 @@ async def delete_client(
     if not db_client:
         raise HTTPException(status_code=404, detail="Client not found")
     
+    days = booking_days(db, Booking.client_id == client_id) | sale_days(db, Sale.client_id == client_id)
     db.delete(db_client)
+    refresh_revenue_days(db, days)
     db.commit()
+    invalidate_dashboard()
+    availability_index.invalidate()
     return {"message": "Client deleted successfully"}
 
 
 @router.post("/bulk-delete")
-async def bulk_delete_clients(
+def bulk_delete_clients(
     ids: list[int],
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Delete multiple clients by IDs"""
+    days = booking_days(db, Booking.client_id.in_(ids)) | sale_days(db, Sale.client_id.in_(ids))
     deleted_count = db.query(Client).filter(Client.id.in_(ids)).delete(synchronize_session=False)
+    refresh_revenue_days(db, days)
     db.commit()
+    invalidate_dashboard()
+    availability_index.invalidate()
     return {"message": f"{deleted_count} clients deleted successfully", "deleted_count": deleted_count}
 
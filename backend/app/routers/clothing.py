@@ -1,44 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc, desc
+from sqlalchemy.orm import Session, raiseload, selectinload, undefer
 from typing import List, Optional, Literal
-import os
-import uuid
 
 from ..database import get_db
-from ..config import get_settings
 from ..models.clothing import Clothing, ClothingImage
+from ..models.sale import Sale
 from ..schemas.clothing import ClothingCreate, ClothingUpdate, ClothingResponse, ClothingListResponse
+from ..services.dashboard import invalidate_dashboard
+from ..services.images import StoredImage, release_images, store_uploads
+from ..services.revenue import sale_days, refresh_revenue_days
+from ..utils.images import ListView
+from ..utils.pagination import CountMode, paginate, paginate_ranked, sort_column_for
+from ..utils.search import MatchMode, text_search
 from .auth import get_current_user
 
 router = APIRouter()
-settings = get_settings()
 
 
 @router.get("/", response_model=ClothingListResponse)
-async def get_clothing(
+def get_clothing(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     search: Optional[str] = None,
+    match: MatchMode = Query("contains", description="How search matches: contains, prefix or fuzzy"),
     category: Optional[str] = None,
     size: Optional[str] = None,
     in_stock: Optional[bool] = None,
-    sort_by: Optional[str] = Query("created_at", description="Field to sort by: name, sale_price, created_at"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by: name, sale_price, created_at, relevance (default: created_at, or relevance for fuzzy search)"),
     sort_order: Optional[Literal["asc", "desc"]] = Query("desc", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; seeks instead of skipping"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
+    view: ListView = Query("full", description="full: every image; list: primary image and thumbnail paths only, images null"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all clothing items with optional filters, sorting, and pagination"""
-    query = db.query(Clothing)
+    # The primary image comes from a correlated subquery; the gallery only in full view
+    images = selectinload(Clothing.images) if view == "full" else raiseload(Clothing.images)
+    query = db.query(Clothing).options(undefer(Clothing.primary_image_path), undefer(Clothing.primary_thumbnail_path), images)
     
+    rank = None
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                Clothing.name.ilike(search_filter),
-                Clothing.description.ilike(search_filter)
-            )
-        )
+        search_filter, rank = text_search(search, [Clothing.name_normalized], [Clothing.description], match)
+        query = query.filter(search_filter)
     
     if category:
         query = query.filter(Clothing.category == category)
@@ -52,22 +56,24 @@ async def get_clothing(
         else:
             query = query.filter(Clothing.stock_quantity == 0)
     
-    total = query.count()
-    
-    # Apply sorting
-    sort_column = getattr(Clothing, sort_by, Clothing.created_at)
-    if sort_order == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        query = query.order_by(desc(sort_column))
+    # Best matches first when asked for, or by default for fuzzy search
+    if rank is not None and (sort_by == "relevance" or (sort_by is None and match == "fuzzy")):
+        items, total, next_cursor = paginate_ranked(
+            db, query, rank, Clothing.id, skip, limit, count
+        )
+        return {"items": items, "total": total, "next_cursor": next_cursor}
     
-    items = query.offset(skip).limit(limit).all()
+    # Apply sorting and offset or keyset pagination
+    sort_column = sort_column_for(Clothing, sort_by, Clothing.created_at)
+    items, total, next_cursor = paginate(
+        db, query, sort_column, Clothing.id, sort_order, skip, limit, cursor, count
+    )
     
-    return {"items": items, "total": total}
+    return {"items": items, "total": total, "next_cursor": next_cursor}
 
 
 @router.get("/{item_id}", response_model=ClothingResponse)
-async def get_clothing_item(
+def get_clothing_item(
     item_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -80,7 +86,7 @@ async def get_clothing_item(
 
 
 @router.post("/", response_model=ClothingResponse)
-async def create_clothing(
+def create_clothing(
     name: str = Form(...),
     category: str = Form(...),
     size: str = Form(...),
@@ -94,48 +100,41 @@ async def create_clothing(
     current_user = Depends(get_current_user)
 ):
     """Create a new clothing item with optional images"""
-    db_item = Clothing(
-        name=name,
-        category=category,
-        size=size,
-        color=color,
-        purchase_price=purchase_price,
-        sale_price=sale_price,
-        stock_quantity=stock_quantity,
-        description=description
-    )
-    db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
-    
-    # Handle image uploads
-    for idx, image in enumerate(images):
-        if image.filename:
-            ext = image.filename.split(".")[-1].lower()
-            if ext not in settings.allowed_extensions:
-                continue
-            
-            filename = f"{uuid.uuid4()}.{ext}"
-            filepath = f"{settings.upload_dir}/clothing/{filename}"
-            
-            with open(filepath, "wb") as f:
-                content = await image.read()
-                f.write(content)
-            
+    # Images are stored first, so a rejected file (e.g. too large) fails the
+    # request before anything is recorded; the item and its image rows commit
+    # together while the stored files are held
+    with store_uploads(db, images) as stored_images:
+        db_item = Clothing(
+            name=name,
+            category=category,
+            size=size,
+            color=color,
+            purchase_price=purchase_price,
+            sale_price=sale_price,
+            stock_quantity=stock_quantity,
+            description=description
+        )
+        db.add(db_item)
+        db.flush()
+        
+        for idx, stored in enumerate(stored_images):
             db_image = ClothingImage(
                 clothing_id=db_item.id,
-                image_path=f"/uploads/clothing/{filename}",
+                image_path=stored.image_path,
+                variants=stored.variants,
+                content_hash=stored.content_hash,
                 is_primary=(idx == 0)
             )
             db.add(db_image)
-    
-    db.commit()
+        
+        db.commit()
+    invalidate_dashboard()
     db.refresh(db_item)
     return db_item
 
 
 @router.put("/{item_id}", response_model=ClothingResponse)
-async def update_clothing(
+def update_clothing(
     item_id: int,
     item: ClothingUpdate,
     db: Session = Depends(get_db),
@@ -150,13 +149,18 @@ async def update_clothing(
     for field, value in update_data.items():
         setattr(db_item, field, value)
     
+    # Sales cost in the revenue rollup is priced at the current purchase price
+    if "purchase_price" in update_data:
+        refresh_revenue_days(db, sale_days(db, Sale.clothing_id == item_id))
+    
     db.commit()
+    invalidate_dashboard()
     db.refresh(db_item)
     return db_item
 
 
 @router.post("/{item_id}/images")
-async def upload_clothing_images(
+def upload_clothing_images(
     item_id: int,
     images: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
@@ -168,33 +172,24 @@ async def upload_clothing_images(
         raise HTTPException(status_code=404, detail="Clothing item not found")
     
     uploaded = []
-    for image in images:
-        if image.filename:
-            ext = image.filename.split(".")[-1].lower()
-            if ext not in settings.allowed_extensions:
-                continue
-            
-            filename = f"{uuid.uuid4()}.{ext}"
-            filepath = f"{settings.upload_dir}/clothing/{filename}"
-            
-            with open(filepath, "wb") as f:
-                content = await image.read()
-                f.write(content)
-            
+    with store_uploads(db, images) as stored_images:
+        for stored in stored_images:
             db_image = ClothingImage(
                 clothing_id=item_id,
-                image_path=f"/uploads/clothing/{filename}",
+                image_path=stored.image_path,
+                variants=stored.variants,
+                content_hash=stored.content_hash,
                 is_primary=False
             )
             db.add(db_image)
             uploaded.append(db_image.image_path)
-    
-    db.commit()
+        
+        db.commit()
     return {"uploaded": uploaded}
 
 
 @router.delete("/{item_id}/images/{image_id}")
-async def delete_clothing_image(
+def delete_clothing_image(
     item_id: int,
     image_id: int,
     db: Session = Depends(get_db),
@@ -209,19 +204,17 @@ async def delete_clothing_image(
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Delete file from disk
-    filename = image.image_path.replace("/uploads/", "")
-    filepath = os.path.join(settings.upload_dir, filename)
-    if os.path.exists(filepath):
-        os.remove(filepath)
-    
+    released = StoredImage.of(image)
     db.delete(image)
     db.commit()
+    
+    # Delete the file and its variants unless another image shares the content
+    release_images(db, [released])
     return {"message": "Image deleted successfully"}
 
 
 @router.delete("/{item_id}")
-async def delete_clothing(
+def delete_clothing(
     item_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -231,14 +224,15 @@ async def delete_clothing(
     if not item:
         raise HTTPException(status_code=404, detail="Clothing item not found")
     
-    # Delete associated images from disk
-    for image in item.images:
-        filename = image.image_path.replace("/uploads/", "")
-        filepath = os.path.join(settings.upload_dir, filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
+    released = [StoredImage.of(image) for image in item.images]
     
+    days = sale_days(db, Sale.clothing_id == item_id)
     db.delete(item)
+    refresh_revenue_days(db, days)
     db.commit()
+    invalidate_dashboard()
+    
+    # Delete image files no other dress or clothing image shares
+    release_images(db, released)
     return {"message": "Clothing item deleted successfully"}
 
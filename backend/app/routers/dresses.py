@@ -1,45 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc, desc
+from sqlalchemy.orm import Session, raiseload, selectinload, undefer
+from sqlalchemy import and_, exists, func
 from typing import List, Optional, Literal
-import os
-import uuid
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from ..database import get_db
-from ..config import get_settings
 from ..models.dress import Dress, DressImage
+from ..models.booking import Booking
 from ..schemas.dress import DressCreate, DressUpdate, DressResponse, DressListResponse
+from ..services.availability import availability_index
+from ..services.dashboard import invalidate_dashboard
+from ..services.images import StoredImage, release_images, store_uploads
+from ..services.revenue import booking_days, refresh_revenue_days
+from ..utils.images import ListView
+from ..utils.pagination import CountMode, paginate, paginate_ranked, sort_column_for
+from ..utils.search import MatchMode, text_search
 from .auth import get_current_user
 
 router = APIRouter()
-settings = get_settings()
 
 
 @router.get("/", response_model=DressListResponse)
-async def get_dresses(
+def get_dresses(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     search: Optional[str] = None,
+    match: MatchMode = Query("contains", description="How search matches: contains, prefix or fuzzy"),
     status: Optional[str] = None,
     category: Optional[str] = None,
     size: Optional[str] = None,
-    sort_by: Optional[str] = Query("created_at", description="Field to sort by: name, rental_price, created_at"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by: name, rental_price, created_at, relevance (default: created_at, or relevance for fuzzy search)"),
     sort_order: Optional[Literal["asc", "desc"]] = Query("desc", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; seeks instead of skipping"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
+    view: ListView = Query("full", description="full: every image; list: primary image and thumbnail paths only, images null"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all dresses with optional filters, sorting, and pagination"""
-    query = db.query(Dress)
+    # The primary image comes from a correlated subquery; the gallery only in full view
+    images = selectinload(Dress.images) if view == "full" else raiseload(Dress.images)
+    query = db.query(Dress).options(undefer(Dress.primary_image_path), undefer(Dress.primary_thumbnail_path), images)
     
+    rank = None
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                Dress.name.ilike(search_filter),
-                Dress.description.ilike(search_filter)
-            )
-        )
+        search_filter, rank = text_search(search, [Dress.name_normalized], [Dress.description], match)
+        query = query.filter(search_filter)
     
     if status:
         query = query.filter(Dress.status == status)
@@ -50,22 +56,77 @@ async def get_dresses(
     if size:
         query = query.filter(Dress.size == size)
     
-    total = query.count()
+    # Best matches first when asked for, or by default for fuzzy search
+    if rank is not None and (sort_by == "relevance" or (sort_by is None and match == "fuzzy")):
+        dresses, total, next_cursor = paginate_ranked(
+            db, query, rank, Dress.id, skip, limit, count
+        )
+        return {"dresses": dresses, "total": total, "next_cursor": next_cursor}
+    
+    # Apply sorting and offset or keyset pagination
+    sort_column = sort_column_for(Dress, sort_by, Dress.created_at)
+    dresses, total, next_cursor = paginate(
+        db, query, sort_column, Dress.id, sort_order, skip, limit, cursor, count
+    )
+    
+    return {"dresses": dresses, "total": total, "next_cursor": next_cursor}
+
+
+@router.get("/available", response_model=DressListResponse)
+def get_available_dresses(
+    start: date,
+    end: date,
+    size: Optional[str] = None,
+    category: Optional[str] = None,
+    buffer_days: int = Query(0, ge=0, le=30, description="Days kept free before and after each booking for cleaning"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get dresses with no active booking between start and end"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="End date must be on or after start date")
+    
+    # Widen the requested window so bookings within the buffer also block
+    window_start = start - timedelta(days=buffer_days)
+    window_end = end + timedelta(days=buffer_days)
     
-    # Apply sorting
-    sort_column = getattr(Dress, sort_by, Dress.created_at)
-    if sort_order == "asc":
-        query = query.order_by(asc(sort_column))
+    # List projection: primary image and thumbnail only, no gallery
+    query = db.query(Dress).options(
+        undefer(Dress.primary_image_path), undefer(Dress.primary_thumbnail_path), raiseload(Dress.images)
+    ).filter(
+        Dress.status.is_distinct_from("maintenance")
+    )
+    
+    busy = availability_index.busy_dresses(window_start, window_end)
+    if busy is not None:
+        query = query.filter(Dress.id.notin_(sorted(busy)))
     else:
-        query = query.order_by(desc(sort_column))
+        # Anti-join matching the bookings_no_overlap GiST index (dress_id =, daterange &&)
+        window = func.daterange(window_start, window_end, "[]")
+        booked = exists().where(
+            and_(
+                Booking.dress_id == Dress.id,
+                Booking.booking_status != "cancelled",
+                func.daterange(Booking.start_date, Booking.end_date, "[]").op("&&")(window)
+            )
+        )
+        query = query.filter(~booked)
     
-    dresses = query.offset(skip).limit(limit).all()
+    if size:
+        query = query.filter(Dress.size == size)
+    
+    if category:
+        query = query.filter(Dress.category == category)
     
-    return {"dresses": dresses, "total": total}
+    # Counted over the whole anti-join, not just the returned page
+    total = query.order_by(None).count()
+    dresses = query.order_by(Dress.name, Dress.id).limit(limit).all()
+    return {"dresses": dresses, "total": total, "next_cursor": None}
 
 
 @router.get("/{dress_id}", response_model=DressResponse)
-async def get_dress(
+def get_dress(
     dress_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -78,7 +139,7 @@ async def get_dress(
 
 
 @router.post("/", response_model=DressResponse)
-async def create_dress(
+def create_dress(
     name: str = Form(...),
     category: str = Form(...),
     size: str = Form(...),
@@ -91,48 +152,41 @@ async def create_dress(
     current_user = Depends(get_current_user)
 ):
     """Create a new dress with optional images"""
-    db_dress = Dress(
-        name=name,
-        category=category,
-        size=size,
-        color=color,
-        rental_price=rental_price,
-        deposit_amount=deposit_amount,
-        description=description,
-        status="available"
-    )
-    db.add(db_dress)
-    db.commit()
-    db.refresh(db_dress)
-    
-    # Handle image uploads
-    for idx, image in enumerate(images):
-        if image.filename:
-            ext = image.filename.split(".")[-1].lower()
-            if ext not in settings.allowed_extensions:
-                continue
-            
-            filename = f"{uuid.uuid4()}.{ext}"
-            filepath = f"{settings.upload_dir}/dresses/{filename}"
-            
-            with open(filepath, "wb") as f:
-                content = await image.read()
-                f.write(content)
-            
+    # Images are stored first, so a rejected file (e.g. too large) fails the
+    # request before anything is recorded; the item and its image rows commit
+    # together while the stored files are held
+    with store_uploads(db, images) as stored_images:
+        db_dress = Dress(
+            name=name,
+            category=category,
+            size=size,
+            color=color,
+            rental_price=rental_price,
+            deposit_amount=deposit_amount,
+            description=description,
+            status="available"
+        )
+        db.add(db_dress)
+        db.flush()
+        
+        for idx, stored in enumerate(stored_images):
             db_image = DressImage(
                 dress_id=db_dress.id,
-                image_path=f"/uploads/dresses/{filename}",
+                image_path=stored.image_path,
+                variants=stored.variants,
+                content_hash=stored.content_hash,
                 is_primary=(idx == 0)
             )
             db.add(db_image)
-    
-    db.commit()
+        
+        db.commit()
+    invalidate_dashboard()
     db.refresh(db_dress)
     return db_dress
 
 
 @router.put("/{dress_id}", response_model=DressResponse)
-async def update_dress(
+def update_dress(
     dress_id: int,
     dress: DressUpdate,
     db: Session = Depends(get_db),
@@ -153,7 +207,7 @@ async def update_dress(
 
 
 @router.post("/{dress_id}/images")
-async def upload_dress_images(
+def upload_dress_images(
     dress_id: int,
     images: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
@@ -165,33 +219,24 @@ async def upload_dress_images(
         raise HTTPException(status_code=404, detail="Dress not found")
     
     uploaded = []
-    for image in images:
-        if image.filename:
-            ext = image.filename.split(".")[-1].lower()
-            if ext not in settings.allowed_extensions:
-                continue
-            
-            filename = f"{uuid.uuid4()}.{ext}"
-            filepath = f"{settings.upload_dir}/dresses/{filename}"
-            
-            with open(filepath, "wb") as f:
-                content = await image.read()
-                f.write(content)
-            
+    with store_uploads(db, images) as stored_images:
+        for stored in stored_images:
             db_image = DressImage(
                 dress_id=dress_id,
-                image_path=f"/uploads/dresses/{filename}",
+                image_path=stored.image_path,
+                variants=stored.variants,
+                content_hash=stored.content_hash,
                 is_primary=False
             )
             db.add(db_image)
             uploaded.append(db_image.image_path)
-    
-    db.commit()
+        
+        db.commit()
     return {"uploaded": uploaded}
 
 
 @router.delete("/{dress_id}/images/{image_id}")
-async def delete_dress_image(
+def delete_dress_image(
     dress_id: int,
     image_id: int,
     db: Session = Depends(get_db),
@@ -206,19 +251,17 @@ async def delete_dress_image(
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Delete file from disk
-    filename = image.image_path.replace("/uploads/", "")
-    filepath = os.path.join(settings.upload_dir, filename)
-    if os.path.exists(filepath):
-        os.remove(filepath)
-    
+    released = StoredImage.of(image)
     db.delete(image)
     db.commit()
+    
+    # Delete the file and its variants unless another image shares the content
+    release_images(db, [released])
     return {"message": "Image deleted successfully"}
 
 
 @router.delete("/{dress_id}")
-async def delete_dress(
+def delete_dress(
     dress_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -228,14 +271,16 @@ async def delete_dress(
     if not dress:
         raise HTTPException(status_code=404, detail="Dress not found")
     
-    # Delete associated images from disk
-    for image in dress.images:
-        filename = image.image_path.replace("/uploads/", "")
-        filepath = os.path.join(settings.upload_dir, filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
+    released = [StoredImage.of(image) for image in dress.images]
     
+    days = booking_days(db, Booking.dress_id == dress_id)
     db.delete(dress)
+    refresh_revenue_days(db, days)
     db.commit()
+    invalidate_dashboard()
+    availability_index.remove_dress(dress_id)
+    
+    # Delete image files no other dress or clothing image shares
+    release_images(db, released)
     return {"message": "Dress deleted successfully"}
 
@@ -1,19 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, IO
 from datetime import date
-import io
 
 from ..database import get_db
 from ..services.excel import ExcelService
+from ..services.dashboard import invalidate_dashboard
 from .auth import get_current_user
 
 router = APIRouter()
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_file(output: IO[bytes]):
+    """Yield a spooled export in chunks, closing (and deleting) it at the end"""
+    try:
+        while chunk := output.read(CHUNK_SIZE):
+            yield chunk
+    finally:
+        output.close()
+
+
+def xlsx_response(output: IO[bytes], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        iter_file(output),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 
 @router.get("/clients")
-async def export_clients(
+def export_clients(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -21,15 +41,11 @@ async def export_clients(
     excel_service = ExcelService(db)
     output = excel_service.export_clients()
     
-    return StreamingResponse(
-        io.BytesIO(output),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=clients.xlsx"}
-    )
+    return xlsx_response(output, "clients.xlsx")
 
 
 @router.get("/dresses")
-async def export_dresses(
+def export_dresses(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -37,15 +53,11 @@ async def export_dresses(
     excel_service = ExcelService(db)
     output = excel_service.export_dresses()
     
-    return StreamingResponse(
-        io.BytesIO(output),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=dresses.xlsx"}
-    )
+    return xlsx_response(output, "dresses.xlsx")
 
 
 @router.get("/clothing")
-async def export_clothing(
+def export_clothing(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -53,15 +65,11 @@ async def export_clothing(
     excel_service = ExcelService(db)
     output = excel_service.export_clothing()
     
-    return StreamingResponse(
-        io.BytesIO(output),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=clothing.xlsx"}
-    )
+    return xlsx_response(output, "clothing.xlsx")
 
 
 @router.get("/bookings")
-async def export_bookings(
+def export_bookings(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
@@ -71,15 +79,11 @@ async def export_bookings(
     excel_service = ExcelService(db)
     output = excel_service.export_bookings(start_date, end_date)
     
-    return StreamingResponse(
-        io.BytesIO(output),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=bookings.xlsx"}
-    )
+    return xlsx_response(output, "bookings.xlsx")
 
 
 @router.get("/sales")
-async def export_sales(
+def export_sales(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
@@ -89,15 +93,11 @@ async def export_sales(
     excel_service = ExcelService(db)
     output = excel_service.export_sales(start_date, end_date)
     
-    return StreamingResponse(
-        io.BytesIO(output),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=sales.xlsx"}
-    )
+    return xlsx_response(output, "sales.xlsx")
 
 
 @router.get("/commercial-report")
-async def export_commercial_report(
+def export_commercial_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
@@ -107,15 +107,11 @@ async def export_commercial_report(
     excel_service = ExcelService(db)
     output = excel_service.export_commercial_report(start_date, end_date)
     
-    return StreamingResponse(
-        io.BytesIO(output),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=commercial_report_{date.today()}.xlsx"}
-    )
+    return xlsx_response(output, f"commercial_report_{date.today()}.xlsx")
 
 
 @router.post("/import/clients")
-async def import_clients(
+def import_clients(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -124,18 +120,18 @@ async def import_clients(
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
     
-    contents = await file.read()
     excel_service = ExcelService(db)
     
     try:
-        result = excel_service.import_clients(contents)
+        result = excel_service.import_clients(file.file)
+        invalidate_dashboard()
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
 
 
 @router.post("/import/dresses")
-async def import_dresses(
+def import_dresses(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -144,18 +140,18 @@ async def import_dresses(
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
     
-    contents = await file.read()
     excel_service = ExcelService(db)
     
     try:
-        result = excel_service.import_dresses(contents)
+        result = excel_service.import_dresses(file.file)
+        invalidate_dashboard()
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
 
 
 @router.post("/import/clothing")
-async def import_clothing(
+def import_clothing(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -164,11 +160,11 @@ async def import_clothing(
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
     
-    contents = await file.read()
     excel_service = ExcelService(db)
     
     try:
-        result = excel_service.import_clothing(contents)
+        result = excel_service.import_clothing(file.file)
+        invalidate_dashboard()
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
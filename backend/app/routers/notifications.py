@@ -6,13 +6,14 @@ from ..database import get_db
 from ..services.notification import NotificationService
 from ..models.booking import Booking
 from ..models.client import Client
+from ..utils.pagination import CountMode, paginate
 from .auth import get_current_user
 
 router = APIRouter()
 
 
 @router.post("/send")
-async def send_notification(
+def send_notification(
     client_id: int,
     message: str,
     channel: str = Query("whatsapp", regex="^(sms|whatsapp)$"),
@@ -30,17 +31,17 @@ async def send_notification(
     if channel == "sms":
         if not client.phone:
             raise HTTPException(status_code=400, detail="Client has no phone number")
-        result = service.send_sms(client_id, client.phone, message, notification_type)
+        result = service.send_sms(client_id, client.phone_e164 or client.phone, message, notification_type)
     else:
         if not client.whatsapp:
             raise HTTPException(status_code=400, detail="Client has no WhatsApp number")
-        result = service.send_whatsapp(client_id, client.whatsapp, message, notification_type)
+        result = service.send_whatsapp(client_id, client.whatsapp_e164 or client.whatsapp, message, notification_type)
     
     return result
 
 
 @router.post("/booking/{booking_id}/confirmation")
-async def send_booking_confirmation(
+def send_booking_confirmation(
     booking_id: int,
     channel: str = Query("whatsapp", regex="^(sms|whatsapp)$"),
     db: Session = Depends(get_db),
@@ -64,7 +65,7 @@ async def send_booking_confirmation(
 
 
 @router.post("/booking/{booking_id}/reminder")
-async def send_return_reminder(
+def send_return_reminder(
     booking_id: int,
     channel: str = Query("whatsapp", regex="^(sms|whatsapp)$"),
     db: Session = Depends(get_db),
@@ -87,7 +88,7 @@ async def send_return_reminder(
 
 
 @router.post("/booking/{booking_id}/thank-you")
-async def send_thank_you(
+def send_thank_you(
     booking_id: int,
     channel: str = Query("whatsapp", regex="^(sms|whatsapp)$"),
     db: Session = Depends(get_db),
@@ -108,10 +109,12 @@ async def send_thank_you(
 
 
 @router.get("/logs")
-async def get_notification_logs(
+def get_notification_logs(
     client_id: Optional[int] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; seeks instead of skipping"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -123,8 +126,9 @@ async def get_notification_logs(
     if client_id:
         query = query.filter(NotificationLog.client_id == client_id)
     
-    total = query.count()
-    logs = query.order_by(NotificationLog.sent_at.desc()).offset(skip).limit(limit).all()
+    logs, total, next_cursor = paginate(
+        db, query, NotificationLog.sent_at, NotificationLog.id, "desc", skip, limit, cursor, count
+    )
     
-    return {"logs": logs, "total": total}
+    return {"logs": logs, "total": total, "next_cursor": next_cursor}
 
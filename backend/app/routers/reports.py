@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func, extract, literal, select, union_all
 from typing import Optional
 from datetime import date, datetime, timedelta
 
@@ -8,7 +8,6 @@ from ..database import get_db
 from ..models.booking import Booking
 from ..models.sale import Sale
 from ..models.dress import Dress
-from ..models.clothing import Clothing
 from ..models.client import Client
 from ..schemas.reports import (
     DashboardStats, 
@@ -17,91 +16,24 @@ from ..schemas.reports import (
     TopClientsReport,
     MonthlyEarnings
 )
+from ..services import dashboard as dashboard_service
+from ..services.revenue import revenue_by_period
 from .auth import get_current_user
 
 router = APIRouter()
 
 
 @router.get("/dashboard", response_model=DashboardStats)
-async def get_dashboard_stats(
+def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get dashboard overview statistics"""
-    today = date.today()
-    start_of_month = today.replace(day=1)
-    
-    # Total counts
-    total_clients = db.query(Client).count()
-    total_dresses = db.query(Dress).count()
-    total_clothing = db.query(Clothing).count()
-    
-    # Active bookings (confirmed or in_progress)
-    active_bookings = db.query(Booking).filter(
-        Booking.booking_status.in_(["confirmed", "in_progress"])
-    ).count()
-    
-    # Monthly revenue from bookings
-    monthly_rental_revenue = db.query(func.sum(Booking.rental_price)).filter(
-        Booking.start_date >= start_of_month,
-        Booking.booking_status != "cancelled"
-    ).scalar() or 0
-    
-    # Monthly revenue from sales
-    monthly_sales_revenue = db.query(func.sum(Sale.total_price)).filter(
-        Sale.sale_date >= start_of_month
-    ).scalar() or 0
-    
-    # Monthly cost from sales (based on purchase_price)
-    monthly_sales_with_cost = db.query(
-        func.sum(Sale.quantity * Clothing.purchase_price)
-    ).join(
-        Clothing, Sale.clothing_id == Clothing.id
-    ).filter(
-        Sale.sale_date >= start_of_month,
-        Clothing.purchase_price.isnot(None)
-    ).scalar() or 0
-    
-    monthly_sales_profit = float(monthly_sales_revenue) - float(monthly_sales_with_cost)
-    
-    # Pending deposits
-    pending_deposits = db.query(func.sum(Booking.deposit_amount)).filter(
-        Booking.deposit_status == "pending",
-        Booking.booking_status != "cancelled"
-    ).scalar() or 0
-    
-    # Low stock items (less than 3)
-    low_stock_count = db.query(Clothing).filter(
-        Clothing.stock_quantity < 3,
-        Clothing.stock_quantity > 0
-    ).count()
-    
-    # Upcoming returns (bookings ending in next 7 days)
-    next_week = today + timedelta(days=7)
-    upcoming_returns = db.query(Booking).filter(
-        Booking.end_date >= today,
-        Booking.end_date <= next_week,
-        Booking.booking_status == "in_progress"
-    ).count()
-    
-    return {
-        "total_clients": total_clients,
-        "total_dresses": total_dresses,
-        "total_clothing": total_clothing,
-        "active_bookings": active_bookings,
-        "monthly_rental_revenue": float(monthly_rental_revenue),
-        "monthly_sales_revenue": float(monthly_sales_revenue),
-        "monthly_total_revenue": float(monthly_rental_revenue + monthly_sales_revenue),
-        "monthly_sales_cost": float(monthly_sales_with_cost),
-        "monthly_sales_profit": monthly_sales_profit,
-        "pending_deposits": float(pending_deposits),
-        "low_stock_count": low_stock_count,
-        "upcoming_returns": upcoming_returns
-    }
+    return dashboard_service.get_dashboard_stats(db)
 
 
 @router.get("/earnings", response_model=EarningsReport)
-async def get_earnings_report(
+def get_earnings_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     period: str = Query("monthly", regex="^(daily|weekly|monthly|yearly)$"),
@@ -114,42 +46,15 @@ async def get_earnings_report(
     if not start_date:
         start_date = end_date - timedelta(days=365)
     
-    # Get rental earnings
-    rental_query = db.query(
-        func.date_trunc(period if period != "daily" else "day", Booking.start_date).label("period"),
-        func.sum(Booking.rental_price).label("amount")
-    ).filter(
-        Booking.start_date >= start_date,
-        Booking.start_date <= end_date,
-        Booking.booking_status != "cancelled"
-    ).group_by("period").all()
-    
-    # Get sales earnings with cost
-    sales_query = db.query(
-        func.date_trunc(period if period != "daily" else "day", Sale.sale_date).label("period"),
-        func.sum(Sale.total_price).label("amount"),
-        func.sum(Sale.quantity * Clothing.purchase_price).label("cost")
-    ).join(
-        Clothing, Sale.clothing_id == Clothing.id
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by("period").all()
-    
-    # Combine into periods
+    # Re-aggregate the daily revenue rollup into the requested buckets
     periods_data = {}
-    for row in rental_query:
-        period_key = row.period.strftime("%Y-%m-%d") if row.period else "Unknown"
-        if period_key not in periods_data:
-            periods_data[period_key] = {"rentals": 0, "sales": 0, "sales_cost": 0}
-        periods_data[period_key]["rentals"] = float(row.amount or 0)
-    
-    for row in sales_query:
+    for row in revenue_by_period(db, start_date, end_date, period):
         period_key = row.period.strftime("%Y-%m-%d") if row.period else "Unknown"
-        if period_key not in periods_data:
-            periods_data[period_key] = {"rentals": 0, "sales": 0, "sales_cost": 0}
-        periods_data[period_key]["sales"] = float(row.amount or 0)
-        periods_data[period_key]["sales_cost"] = float(row.cost or 0)
+        periods_data[period_key] = {
+            "rentals": float(row.rentals or 0),
+            "sales": float(row.sales or 0),
+            "sales_cost": float(row.sales_cost or 0)
+        }
     
     # Format response
     monthly_earnings = [
@@ -184,7 +89,7 @@ async def get_earnings_report(
 
 
 @router.get("/top-dresses", response_model=TopDressesReport)
-async def get_top_dresses(
+def get_top_dresses(
     limit: int = Query(10, ge=1, le=50),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
@@ -226,7 +131,7 @@ async def get_top_dresses(
 
 
 @router.get("/top-clients", response_model=TopClientsReport)
-async def get_top_clients(
+def get_top_clients(
     limit: int = Query(10, ge=1, le=50),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
@@ -239,69 +144,62 @@ async def get_top_clients(
     if not start_date:
         start_date = end_date - timedelta(days=365)
     
-    # Get rental spending
-    rental_spending = db.query(
-        Client.id,
-        Client.full_name,
+    # Rentals and sales per client in one statement, ranked and limited in SQL
+    rentals = select(
+        Booking.client_id.label("client_id"),
         func.count(Booking.id).label("booking_count"),
-        func.sum(Booking.rental_price).label("rental_spent")
-    ).join(
-        Booking, Client.id == Booking.client_id
-    ).filter(
+        func.sum(Booking.rental_price).label("rental_spent"),
+        literal(0).label("sale_count"),
+        literal(0).label("sales_spent")
+    ).where(
         Booking.start_date >= start_date,
         Booking.start_date <= end_date,
         Booking.booking_status != "cancelled"
-    ).group_by(Client.id, Client.full_name).all()
+    ).group_by(Booking.client_id)
     
-    # Get sales spending
-    sales_spending = db.query(
-        Client.id,
+    sales = select(
+        Sale.client_id.label("client_id"),
+        literal(0).label("booking_count"),
+        literal(0).label("rental_spent"),
         func.count(Sale.id).label("sale_count"),
         func.sum(Sale.total_price).label("sales_spent")
-    ).join(
-        Sale, Client.id == Sale.client_id
-    ).filter(
+    ).where(
         Sale.sale_date >= start_date,
         Sale.sale_date <= end_date
-    ).group_by(Client.id).all()
+    ).group_by(Sale.client_id)
     
-    # Combine data
-    clients_data = {}
-    for row in rental_spending:
-        clients_data[row.id] = {
+    spending = union_all(rentals, sales).subquery("spending")
+    booking_count = func.sum(spending.c.booking_count)
+    rental_spent = func.coalesce(func.sum(spending.c.rental_spent), 0)
+    sale_count = func.sum(spending.c.sale_count)
+    sales_spent = func.coalesce(func.sum(spending.c.sales_spent), 0)
+    total_spent = rental_spent + sales_spent
+    
+    rows = db.query(
+        Client.id,
+        Client.full_name,
+        booking_count.label("booking_count"),
+        rental_spent.label("rental_spent"),
+        sale_count.label("sale_count"),
+        sales_spent.label("sales_spent"),
+        total_spent.label("total_spent")
+    ).join(
+        spending, Client.id == spending.c.client_id
+    ).group_by(Client.id, Client.full_name).order_by(
+        total_spent.desc(), Client.id
+    ).limit(limit).all()
+    
+    clients = [
+        {
             "client_id": row.id,
             "client_name": row.full_name,
-            "booking_count": row.booking_count,
-            "rental_spent": float(row.rental_spent or 0),
-            "sale_count": 0,
-            "sales_spent": 0
+            "booking_count": int(row.booking_count or 0),
+            "rental_spent": float(row.rental_spent),
+            "sale_count": int(row.sale_count or 0),
+            "sales_spent": float(row.sales_spent),
+            "total_spent": float(row.total_spent)
         }
-    
-    for row in sales_spending:
-        if row.id in clients_data:
-            clients_data[row.id]["sale_count"] = row.sale_count
-            clients_data[row.id]["sales_spent"] = float(row.sales_spent or 0)
-        else:
-            client = db.query(Client).filter(Client.id == row.id).first()
-            if client:
-                clients_data[row.id] = {
-                    "client_id": row.id,
-                    "client_name": client.full_name,
-                    "booking_count": 0,
-                    "rental_spent": 0,
-                    "sale_count": row.sale_count,
-                    "sales_spent": float(row.sales_spent or 0)
-                }
-    
-    # Sort by total spending
-    clients = sorted(
-        clients_data.values(),
-        key=lambda x: x["rental_spent"] + x["sales_spent"],
-        reverse=True
-    )[:limit]
-    
-    for c in clients:
-        c["total_spent"] = c["rental_spent"] + c["sales_spent"]
+        for row in rows
+    ]
     
     return {"clients": clients}
-
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import asc, desc
 from typing import Optional, Literal
 from datetime import date
 
@@ -8,13 +7,17 @@ from ..database import get_db
 from ..models.sale import Sale
 from ..models.clothing import Clothing, ClothingImage
 from ..schemas.sale import SaleCreate, SaleUpdate, SaleResponse, SaleListResponse
+from ..services.dashboard import invalidate_dashboard
+from ..services.revenue import sale_days, refresh_revenue_days
+from ..utils.images import ListView
+from ..utils.pagination import CountMode, paginate, sort_column_for
 from .auth import get_current_user
 
 router = APIRouter()
 
 
 @router.get("/", response_model=SaleListResponse)
-async def get_sales(
+def get_sales(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     client_id: Optional[int] = None,
@@ -23,13 +26,19 @@ async def get_sales(
     end_date: Optional[date] = None,
     sort_by: Optional[str] = Query("sale_date", description="Field to sort by: sale_date, total_price, created_at"),
     sort_order: Optional[Literal["asc", "desc"]] = Query("desc", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; seeks instead of skipping"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate or none"),
+    view: ListView = Query("full", description="full: every image; list: primary image and thumbnail paths only, images null"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all sales with optional filters, sorting, and pagination"""
+    # Images load in a separate IN query (full view) rather than multiplying
+    # the joined sale rows, or not at all (list view)
+    clothing = joinedload(Sale.clothing).undefer(Clothing.primary_image_path).undefer(Clothing.primary_thumbnail_path)
     query = db.query(Sale).options(
         joinedload(Sale.client),
-        joinedload(Sale.clothing).joinedload(Clothing.images)
+        clothing.selectinload(Clothing.images) if view == "full" else clothing.raiseload(Clothing.images)
     )
     
     if client_id:
@@ -44,22 +53,17 @@ async def get_sales(
     if end_date:
         query = query.filter(Sale.sale_date <= end_date)
     
-    total = query.count()
-    
-    # Apply sorting
-    sort_column = getattr(Sale, sort_by, Sale.sale_date)
-    if sort_order == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        query = query.order_by(desc(sort_column))
-    
-    sales = query.offset(skip).limit(limit).all()
+    # Apply sorting and offset or keyset pagination
+    sort_column = sort_column_for(Sale, sort_by, Sale.sale_date)
+    sales, total, next_cursor = paginate(
+        db, query, sort_column, Sale.id, sort_order, skip, limit, cursor, count
+    )
     
-    return {"sales": sales, "total": total}
+    return {"sales": sales, "total": total, "next_cursor": next_cursor}
 
 
 @router.get("/{sale_id}", response_model=SaleResponse)
-async def get_sale(
+def get_sale(
     sale_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -76,7 +80,7 @@ async def get_sale(
 
 
 @router.post("/", response_model=SaleResponse)
-async def create_sale(
+def create_sale(
     sale: SaleCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -111,7 +115,9 @@ async def create_sale(
     # Deduct from stock
     clothing.stock_quantity -= sale.quantity
     
+    refresh_revenue_days(db, [db_sale.sale_date])
     db.commit()
+    invalidate_dashboard()
     db.refresh(db_sale)
     
     # Reload with relationships
@@ -122,7 +128,7 @@ async def create_sale(
 
 
 @router.put("/{sale_id}", response_model=SaleResponse)
-async def update_sale(
+def update_sale(
     sale_id: int,
     sale: SaleUpdate,
     db: Session = Depends(get_db),
@@ -134,6 +140,7 @@ async def update_sale(
         raise HTTPException(status_code=404, detail="Sale not found")
     
     update_data = sale.model_dump(exclude_unset=True)
+    previous_sale_date = db_sale.sale_date
     
     # Handle quantity change - adjust stock
     if "quantity" in update_data:
@@ -157,7 +164,9 @@ async def update_sale(
     for field, value in update_data.items():
         setattr(db_sale, field, value)
     
+    refresh_revenue_days(db, [previous_sale_date, db_sale.sale_date])
     db.commit()
+    invalidate_dashboard()
     db.refresh(db_sale)
     
     return db.query(Sale).options(
@@ -167,7 +176,7 @@ async def update_sale(
 
 
 @router.delete("/{sale_id}")
-async def delete_sale(
+def delete_sale(
     sale_id: int,
     restore_stock: bool = True,
     db: Session = Depends(get_db),
@@ -185,12 +194,14 @@ async def delete_sale(
             clothing.stock_quantity += sale.quantity
     
     db.delete(sale)
+    refresh_revenue_days(db, [sale.sale_date])
     db.commit()
+    invalidate_dashboard()
     return {"message": "Sale deleted successfully", "stock_restored": restore_stock}
 
 
 @router.post("/bulk-delete")
-async def bulk_delete_sales(
+def bulk_delete_sales(
     ids: list[int],
     restore_stock: bool = True,
     db: Session = Depends(get_db),
@@ -206,7 +217,10 @@ async def bulk_delete_sales(
                 clothing.stock_quantity += sale.quantity
     
     # Now delete the sales
+    days = sale_days(db, Sale.id.in_(ids))
     deleted_count = db.query(Sale).filter(Sale.id.in_(ids)).delete(synchronize_session=False)
+    refresh_revenue_days(db, days)
     db.commit()
+    invalidate_dashboard()
     return {"message": f"{deleted_count} sales deleted successfully", "deleted_count": deleted_count, "stock_restored": restore_stock}
 
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..schemas.search import SearchResponse
+from ..services.search import global_search, search_cache
+from .auth import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(5, ge=1, le=20, description="Hits per entity type"),
+    current_user = Depends(get_current_user)
+):
+    """Search clients, dresses, clothing, bookings and sales at once"""
+    q = q.strip()
+    if len(q) < 2:
+        raise HTTPException(status_code=400, detail="Search term must be at least 2 characters")
+    return global_search(q, limit)
+
+
+@router.get("/cache-stats")
+def get_search_cache_stats(current_user = Depends(get_current_user)):
+    """Get global search cache statistics"""
+    return search_cache.stats()
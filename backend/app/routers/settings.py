@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 import os
 import uuid
@@ -7,6 +7,7 @@ from ..database import get_db
 from ..config import get_settings
 from ..models.settings import Settings
 from ..schemas.settings import SettingsUpdate, SettingsResponse
+from ..services.images import image_pool, normalize_logo, save_upload
 from .auth import get_current_user
 
 router = APIRouter()
@@ -29,7 +30,7 @@ def get_or_create_settings(db: Session) -> Settings:
 
 
 @router.get("/", response_model=SettingsResponse)
-async def get_app_settings(
+def get_app_settings(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -38,7 +39,7 @@ async def get_app_settings(
 
 
 @router.get("/public", response_model=SettingsResponse)
-async def get_public_settings(
+def get_public_settings(
     db: Session = Depends(get_db)
 ):
     """Get public settings (no auth required - for login page)"""
@@ -46,7 +47,7 @@ async def get_public_settings(
 
 
 @router.put("/", response_model=SettingsResponse)
-async def update_settings(
+def update_settings(
     settings_update: SettingsUpdate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -64,7 +65,7 @@ async def update_settings(
 
 
 @router.post("/logo", response_model=SettingsResponse)
-async def upload_logo(
+def upload_logo(
     logo: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -75,14 +76,25 @@ async def upload_logo(
     # Validate file extension
     ext = logo.filename.split(".")[-1].lower()
     if ext not in config.allowed_extensions:
-        from fastapi import HTTPException
         raise HTTPException(status_code=400, detail="Invalid file type")
     
     # Create logos directory if not exists
     logos_dir = f"{config.upload_dir}/logos"
     os.makedirs(logos_dir, exist_ok=True)
     
-    # Delete old logo if exists
+    # Save new logo
+    filename = f"logo_{uuid.uuid4()}.{ext}"
+    filepath = f"{logos_dir}/{filename}"
+    
+    save_upload(logo, filepath)
+    
+    try:
+        image_pool.submit(normalize_logo, filepath).result()
+    except Exception:
+        os.remove(filepath)
+        raise HTTPException(status_code=400, detail="Invalid image file")
+    
+    # Delete old logo if exists, once the new one is known to be good
     if settings.logo_path:
         # Extract filename from path like /uploads/logos/filename.png
         old_filename = settings.logo_path.replace("/uploads/", "")
@@ -90,14 +102,6 @@ async def upload_logo(
         if os.path.exists(old_path):
             os.remove(old_path)
     
-    # Save new logo
-    filename = f"logo_{uuid.uuid4()}.{ext}"
-    filepath = f"{logos_dir}/{filename}"
-    
-    with open(filepath, "wb") as f:
-        content = await logo.read()
-        f.write(content)
-    
     settings.logo_path = f"/uploads/logos/{filename}"
     db.commit()
     db.refresh(settings)
@@ -106,7 +110,7 @@ async def upload_logo(
 
 
 @router.delete("/logo", response_model=SettingsResponse)
-async def delete_logo(
+def delete_logo(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional, List
 from datetime import datetime, date
 from decimal import Decimal
@@ -18,6 +18,12 @@ class BookingBase(BaseModel):
     booking_status: Optional[str] = "confirmed"
     notes: Optional[str] = None
 
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.end_date < self.start_date:
+            raise ValueError("End date must be on or after start date")
+        return self
+
 
 class BookingCreate(BookingBase):
     pass
@@ -32,6 +38,13 @@ class BookingUpdate(BaseModel):
     booking_status: Optional[str] = None
     notes: Optional[str] = None
 
+    @model_validator(mode="after")
+    def check_dates(self):
+        # Partial updates are re-checked against the stored dates in the router
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("End date must be on or after start date")
+        return self
+
 
 class BookingResponse(BaseModel):
     id: int
@@ -55,7 +68,35 @@ class BookingResponse(BaseModel):
 
 class BookingListResponse(BaseModel):
     bookings: List[BookingResponse]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class CompactCalendarEvent(BaseModel):
+    id: int
+    dress_id: int
+    client_id: int
+    start: str
+    end: str
+    color: str
+    status: str
+
+
+class CalendarDress(BaseModel):
+    id: int
+    name: str
+    image_path: Optional[str] = None  # primary image thumbnail only
+
+
+class CalendarClient(BaseModel):
+    id: int
+    full_name: str
+
+
+class CompactCalendarResponse(BaseModel):
+    events: List[CompactCalendarEvent]
+    dresses: List[CalendarDress]
+    clients: List[CalendarClient]
 
 
 class CalendarBooking(BaseModel):
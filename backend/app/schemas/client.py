@@ -25,6 +25,8 @@ class ClientUpdate(BaseModel):
 
 class ClientResponse(ClientBase):
     id: int
+    phone_e164: Optional[str] = None
+    whatsapp_e164: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -32,7 +34,17 @@ class ClientResponse(ClientBase):
         from_attributes = True
 
 
+class ClientSuggestion(BaseModel):
+    id: int
+    full_name: str
+    phone: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 class ClientListResponse(BaseModel):
     clients: List[ClientResponse]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
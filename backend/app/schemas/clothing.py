@@ -1,12 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
 
+from ..utils.images import with_unloaded_images
+
 
 class ClothingImageResponse(BaseModel):
     id: int
     image_path: str
+    variants: Optional[dict] = None  # thumb/medium/full WebP and JPEG paths
     is_primary: bool
 
     class Config:
@@ -43,13 +46,21 @@ class ClothingResponse(ClothingBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
-    images: List[ClothingImageResponse] = []
+    images: Optional[List[ClothingImageResponse]] = None  # None in list views, which skip the gallery
+    primary_image_path: Optional[str] = None
+    primary_thumbnail_path: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+    @model_validator(mode="before")
+    @classmethod
+    def _unloaded_images(cls, data):
+        return with_unloaded_images(cls, data)
+
 
 class ClothingListResponse(BaseModel):
     items: List[ClothingResponse]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
@@ -47,5 +47,6 @@ class SaleResponse(BaseModel):
 
 class SaleListResponse(BaseModel):
     sales: List[SaleResponse]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
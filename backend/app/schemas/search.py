@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class SearchHit(BaseModel):
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    snippet: str  # HTML-escaped text with the match wrapped in <mark></mark>
+
+
+class SearchResponse(BaseModel):
+    query: str
+    clients: List[SearchHit] = []
+    dresses: List[SearchHit] = []
+    clothing: List[SearchHit] = []
+    bookings: List[SearchHit] = []
+    sales: List[SearchHit] = []
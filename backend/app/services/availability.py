@@ -0,0 +1,327 @@
+from bisect import bisect_left, bisect_right, insort
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, aliased
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import logging
+import threading
+import time
+
+from ..config import get_settings
+from ..models.booking import Booking
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# (start_date, end_date, booking_id)
+Interval = Tuple[date, date, int]
+
+
+def _overlapping(intervals: List[Interval], start: date, end: date) -> List[Interval]:
+    """Intervals of one dress that share a day with [start, end]
+
+    Bookings of a dress never overlap (bookings_no_overlap), so a list sorted
+    by start is also sorted by end and both bounds can be bisected.
+    """
+    hi = bisect_right(intervals, end, key=lambda interval: interval[0])
+    lo = bisect_left(intervals, start, 0, hi, key=lambda interval: interval[1])
+    return intervals[lo:hi]
+
+
+class AvailabilityIndex:
+    """
+    In-process occupancy of every dress as sorted booking intervals.
+
+    Holds non-cancelled bookings ending within the history window. Lookups
+    return None whenever the index cannot answer (disabled, cold, stale, past
+    its TTL or asked about dates before the window) and callers then go to
+    the database, which stays authoritative through the exclusion constraint.
+    """
+
+    def __init__(self, enabled: bool, history_days: int, ttl: int):
+        self.enabled = enabled
+        self.history_days = history_days
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._by_dress: Dict[int, List[Interval]] = {}
+        self._bookings: Dict[int, Tuple[int, date, date]] = {}
+        self._horizon: Optional[date] = None
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        self._reloading = False
+        # Writes seen while a load is reading the table, replayed after the swap
+        self._pending: Optional[list] = None
+
+    # Building
+
+    def _rows(self, db: Session, horizon: date):
+        return db.query(
+            Booking.id, Booking.dress_id, Booking.start_date, Booking.end_date
+        ).filter(
+            Booking.booking_status != "cancelled",
+            Booking.end_date >= horizon
+        ).all()
+
+    def load(self, db: Session) -> int:
+        """Replace the index with the current bookings table"""
+        horizon = date.today() - timedelta(days=self.history_days)
+        with self._lock:
+            self._pending = []
+
+        try:
+            rows = self._rows(db, horizon)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        by_dress: Dict[int, List[Interval]] = {}
+        bookings = {}
+        for booking_id, dress_id, start, end in rows:
+            by_dress.setdefault(dress_id, []).append((start, end, booking_id))
+            bookings[booking_id] = (dress_id, start, end)
+        for intervals in by_dress.values():
+            intervals.sort()
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._by_dress = by_dress
+            self._bookings = bookings
+            self._horizon = horizon
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            for replay, args in pending:
+                replay(*args)
+        return len(bookings)
+
+    def rebuild(self):
+        """Load the index using a session of its own"""
+        from ..database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            started_at = time.perf_counter()
+            count = self.load(db)
+            logger.info(
+                f"Availability index loaded {count} bookings in "
+                f"{(time.perf_counter() - started_at) * 1000:.1f} ms"
+            )
+        finally:
+            db.close()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Error loading availability index: {e}")
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def reload_async(self):
+        """Start a background reload unless one is already running"""
+        with self._lock:
+            if not self.enabled or self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    # Freshness
+
+    def usable(self, start: date) -> bool:
+        """Whether lookups for windows starting at `start` can be served from memory"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            expired = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+            fresh = not self._stale and not expired
+            covered = self._horizon is not None and start >= self._horizon
+        if not fresh:
+            self.reload_async()
+        return fresh and covered
+
+    def invalidate(self):
+        """Mark the index stale after writes it cannot follow (e.g. cascades)"""
+        with self._lock:
+            self._stale = True
+
+    # Keeping in sync
+
+    def _discard(self, booking_id: int):
+        previous = self._bookings.pop(booking_id, None)
+        if previous:
+            dress_id, start, end = previous
+            intervals = self._by_dress.get(dress_id, [])
+            i = bisect_left(intervals, (start, end, booking_id))
+            if i < len(intervals) and intervals[i] == (start, end, booking_id):
+                del intervals[i]
+
+    def upsert(self, booking_id: int, dress_id: int, start: date, end: date, status: Optional[str]):
+        """Record a committed booking insert or update"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((self.upsert, (booking_id, dress_id, start, end, status)))
+            self._discard(booking_id)
+            # Mirrors the constraint predicate: NULL status is not indexed either
+            if status is not None and status != "cancelled":
+                insort(self._by_dress.setdefault(dress_id, []), (start, end, booking_id))
+                self._bookings[booking_id] = (dress_id, start, end)
+
+    def remove(self, booking_ids: Iterable[int]):
+        """Record committed booking deletes"""
+        if not self.enabled:
+            return
+        booking_ids = list(booking_ids)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((self.remove, (booking_ids,)))
+            for booking_id in booking_ids:
+                self._discard(booking_id)
+
+    def remove_dress(self, dress_id: int):
+        """Record a committed dress delete (its bookings cascade)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((self.remove_dress, (dress_id,)))
+            for _, _, booking_id in self._by_dress.pop(dress_id, []):
+                self._bookings.pop(booking_id, None)
+
+    # Lookups
+
+    def find_conflict(
+        self, dress_id: int, start: date, end: date, exclude_id: Optional[int] = None
+    ) -> Optional[Tuple[date, date]]:
+        """Dates of a booking of the dress overlapping [start, end], if known"""
+        if not self.usable(start):
+            return None
+        with self._lock:
+            for other_start, other_end, booking_id in _overlapping(self._by_dress.get(dress_id, []), start, end):
+                if booking_id != exclude_id:
+                    return other_start, other_end
+        return None
+
+    def busy_dresses(self, start: date, end: date) -> Optional[Set[int]]:
+        """Ids of dresses booked on any day of [start, end], or None to use the DB"""
+        if not self.usable(start):
+            return None
+        with self._lock:
+            return {
+                dress_id for dress_id, intervals in self._by_dress.items()
+                if _overlapping(intervals, start, end)
+            }
+
+    # Diagnostics
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "ready": self._loaded_at is not None,
+                "stale": self._stale,
+                "reloading": self._reloading,
+                "horizon": self._horizon.isoformat() if self._horizon else None,
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                "dresses": len(self._by_dress),
+                "bookings": len(self._bookings)
+            }
+
+    def verify(self, db: Session) -> dict:
+        """Compare the index with the bookings table; marks it stale on drift"""
+        with self._lock:
+            horizon = self._horizon
+            indexed = dict(self._bookings)
+        if horizon is None:
+            return {"checked": 0, "missing": [], "unexpected": [], "mismatched": []}
+
+        expected = {
+            booking_id: (dress_id, start, end)
+            for booking_id, dress_id, start, end in self._rows(db, horizon)
+        }
+        report = {
+            "checked": len(expected),
+            "missing": sorted(expected.keys() - indexed.keys()),
+            "unexpected": sorted(indexed.keys() - expected.keys()),
+            "mismatched": sorted(
+                booking_id for booking_id in expected.keys() & indexed.keys()
+                if expected[booking_id] != indexed[booking_id]
+            )
+        }
+        if report["missing"] or report["unexpected"] or report["mismatched"]:
+            logger.warning(f"Availability index drifted from bookings: {report}")
+            self.invalidate()
+        return report
+
+
+availability_index = AvailabilityIndex(
+    enabled=settings.availability_index_enabled,
+    history_days=settings.availability_index_history_days,
+    ttl=settings.availability_index_ttl
+)
+
+
+def overlapping_bookings(db: Session, limit: int = 20):
+    """Pairs of non-cancelled bookings of the same dress that share a day"""
+    other = aliased(Booking)
+    return db.query(Booking.id, other.id, Booking.dress_id).join(
+        other,
+        and_(
+            other.dress_id == Booking.dress_id,
+            other.id > Booking.id,
+            other.start_date <= Booking.end_date,
+            other.end_date >= Booking.start_date
+        )
+    ).filter(
+        Booking.booking_status != "cancelled",
+        other.booking_status != "cancelled"
+    ).limit(limit).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process availability index maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("check", help="Build the index from bookings and verify it against the database")
+    parser.parse_args()
+
+    from ..database import SessionLocal
+
+    index = AvailabilityIndex(enabled=True, history_days=settings.availability_index_history_days, ttl=settings.availability_index_ttl)
+    db = SessionLocal()
+    try:
+        started_at = time.perf_counter()
+        index.load(db)
+        elapsed = (time.perf_counter() - started_at) * 1000
+        stats = index.stats()
+        print(f"indexed {stats['bookings']} bookings of {stats['dresses']} dresses since {stats['horizon']} in {elapsed:.1f} ms")
+
+        # The sorted-interval lookups assume a dress is never double-booked
+        overlaps = overlapping_bookings(db)
+        for first, second, dress_id in overlaps:
+            print(f"overlap: dress {dress_id} bookings {first} and {second}")
+
+        # Spot-check in-memory answers against the database for today's window
+        today = date.today()
+        db_busy = {
+            dress_id for (dress_id,) in db.query(Booking.dress_id).filter(
+                Booking.booking_status != "cancelled",
+                Booking.start_date <= today,
+                Booking.end_date >= today
+            ).distinct()
+        }
+        busy = index.busy_dresses(today, today)
+        report = index.verify(db)
+
+        ok = not overlaps and busy == db_busy and not (report["missing"] or report["unexpected"] or report["mismatched"])
+        print(f"busy today: {len(busy)} indexed, {len(db_busy)} in database")
+        print("OK" if ok else f"INCONSISTENT: {report}")
+        raise SystemExit(0 if ok else 1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+
+from ..config import get_settings
+from ..models.booking import Booking
+from ..models.dress import Dress
+from ..models.clothing import Clothing
+from ..models.client import Client
+from ..models.revenue import DailyRevenue
+from ..utils.cache import TTLCache
+
+settings = get_settings()
+
+# Per-process snapshot of the dashboard stats, keyed by day
+dashboard_cache = TTLCache(maxsize=2, ttl=settings.dashboard_cache_ttl)
+
+
+def invalidate_dashboard():
+    """Drop the cached snapshot after writes that change dashboard figures"""
+    dashboard_cache.clear()
+
+
+def compute_dashboard_stats(db: Session, today: date) -> dict:
+    """Compute all dashboard figures in a single round trip"""
+    start_of_month = today.replace(day=1)
+    next_week = today + timedelta(days=7)
+    not_cancelled = Booking.booking_status != "cancelled"
+
+    clients = select(func.count().label("total_clients")).select_from(Client).cte("clients_stats")
+    dresses = select(func.count().label("total_dresses")).select_from(Dress).cte("dresses_stats")
+
+    clothing = select(
+        func.count().label("total_clothing"),
+        func.count().filter(
+            and_(Clothing.stock_quantity < 3, Clothing.stock_quantity > 0)
+        ).label("low_stock_count")
+    ).select_from(Clothing).cte("clothing_stats")
+
+    bookings = select(
+        func.count().filter(
+            Booking.booking_status.in_(["confirmed", "in_progress"])
+        ).label("active_bookings"),
+        func.coalesce(func.sum(Booking.deposit_amount).filter(
+            and_(Booking.deposit_status == "pending", not_cancelled)
+        ), 0).label("pending_deposits"),
+        func.count().filter(
+            and_(
+                Booking.end_date >= today,
+                Booking.end_date <= next_week,
+                Booking.booking_status == "in_progress"
+            )
+        ).label("upcoming_returns")
+    ).select_from(Booking).cte("bookings_stats")
+
+    # Month-to-date income comes from the daily revenue rollup
+    revenue = select(
+        func.coalesce(func.sum(DailyRevenue.rentals), 0).label("monthly_rental_revenue"),
+        func.coalesce(func.sum(DailyRevenue.sales), 0).label("monthly_sales_revenue"),
+        func.coalesce(func.sum(DailyRevenue.sales_cost), 0).label("monthly_sales_cost")
+    ).where(DailyRevenue.day >= start_of_month).cte("revenue_stats")
+
+    row = db.execute(
+        select(clients, dresses, clothing, bookings, revenue)
+    ).mappings().one()
+
+    monthly_rental_revenue = float(row["monthly_rental_revenue"])
+    monthly_sales_revenue = float(row["monthly_sales_revenue"])
+    monthly_sales_cost = float(row["monthly_sales_cost"])
+
+    return {
+        "total_clients": row["total_clients"],
+        "total_dresses": row["total_dresses"],
+        "total_clothing": row["total_clothing"],
+        "active_bookings": row["active_bookings"],
+        "monthly_rental_revenue": monthly_rental_revenue,
+        "monthly_sales_revenue": monthly_sales_revenue,
+        "monthly_total_revenue": monthly_rental_revenue + monthly_sales_revenue,
+        "monthly_sales_cost": monthly_sales_cost,
+        "monthly_sales_profit": monthly_sales_revenue - monthly_sales_cost,
+        "pending_deposits": float(row["pending_deposits"]),
+        "low_stock_count": row["low_stock_count"],
+        "upcoming_returns": row["upcoming_returns"]
+    }
+
+
+def get_dashboard_stats(db: Session) -> dict:
+    """Dashboard stats served from the snapshot cache when fresh"""
+    today = date.today()
+    stats = dashboard_cache.get(today)
+    if stats is None:
+        stats = compute_dashboard_stats(db, today)
+        dashboard_cache.set(today, stats)
+    return stats
@@ -1,15 +1,31 @@
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterable, Optional, IO, Union
 from datetime import date, datetime
 from io import BytesIO
+from itertools import chain, islice
+import tempfile
 
 from ..models.client import Client
 from ..models.dress import Dress
 from ..models.clothing import Clothing
 from ..models.booking import Booking
 from ..models.sale import Sale
+from ..utils.phone import normalize_phone
+from ..utils.text import normalize_text
+from .revenue import revenue_totals
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+# Rows inspected to size columns; later rows are not measured
+WIDTH_SAMPLE_SIZE = 200
+# Validated rows sent per multi-row INSERT on import
+IMPORT_BATCH_SIZE = 1000
 
 
 class ExcelService:
@@ -25,67 +41,133 @@ class ExcelService:
             bottom=Side(style='thin')
         )
 
-    def _style_header(self, ws, row=1):
-        for cell in ws[row]:
+    def _header_row(self, ws, headers: list) -> list:
+        cells = []
+        for value in headers:
+            cell = WriteOnlyCell(ws, value=value)
             cell.font = self.header_font
             cell.fill = self.header_fill
             cell.alignment = self.header_alignment
             cell.border = self.thin_border
+            cells.append(cell)
+        return cells
 
-    def _auto_width(self, ws):
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-    def export_clients(self) -> bytes:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Clients"
-
-        # Headers
+    def _set_widths(self, ws, rows: list):
+        widths = {}
+        for row in rows:
+            for idx, value in enumerate(row, start=1):
+                if value is None:
+                    continue
+                widths[idx] = max(widths.get(idx, 0), len(str(value)))
+        for idx, width in widths.items():
+            ws.column_dimensions[get_column_letter(idx)].width = min(width + 2, 50)
+
+    def _write_sheet(self, wb: Workbook, title: str, headers: list, rows: Iterable[list]):
+        """Append a styled table to a write-only workbook, sizing columns from a sample"""
+        ws = wb.create_sheet(title)
+        rows = iter(rows)
+        sample = list(islice(rows, WIDTH_SAMPLE_SIZE))
+        # Column dimensions must be set before the first row is written
+        self._set_widths(ws, [headers] + sample)
+        ws.append(self._header_row(ws, headers))
+        for row in chain(sample, rows):
+            ws.append(row)
+        return ws
+
+    def _save(self, wb: Workbook) -> IO[bytes]:
+        """Save to a temporary file so the finished workbook never sits in memory"""
+        output = tempfile.TemporaryFile()
+        wb.save(output)
+        output.seek(0)
+        return output
+
+    @staticmethod
+    def _fmt_datetime(value: Optional[datetime]) -> str:
+        return value.strftime("%Y-%m-%d %H:%M") if value else ""
+
+    @staticmethod
+    def _fmt_date(value: Optional[date]) -> str:
+        return value.strftime("%Y-%m-%d") if value else ""
+
+    def _booking_rows(self, *extra_columns):
+        """Flat booking rows with client and dress names joined in, no ORM objects"""
+        return self.db.query(
+            Client.full_name.label("client_name"),
+            Dress.name.label("dress_name"),
+            Booking.start_date,
+            Booking.end_date,
+            Booking.rental_price,
+            Booking.deposit_amount,
+            Booking.booking_status,
+            *extra_columns
+        ).select_from(Booking).outerjoin(
+            Client, Booking.client_id == Client.id
+        ).outerjoin(
+            Dress, Booking.dress_id == Dress.id
+        )
+
+    def _sale_rows(self, *extra_columns):
+        """Flat sale rows with client and item names joined in, no ORM objects"""
+        return self.db.query(
+            Client.full_name.label("client_name"),
+            Clothing.name.label("item_name"),
+            Sale.quantity,
+            Sale.unit_price,
+            Sale.total_price,
+            Sale.sale_date,
+            *extra_columns
+        ).select_from(Sale).outerjoin(
+            Client, Sale.client_id == Client.id
+        ).outerjoin(
+            Clothing, Sale.clothing_id == Clothing.id
+        )
+
+    def export_clients(self) -> IO[bytes]:
+        wb = Workbook(write_only=True)
         headers = ["ID", "Full Name", "Phone", "WhatsApp", "Address", "Notes", "Created At"]
-        ws.append(headers)
-        self._style_header(ws)
 
-        # Data
-        clients = self.db.query(Client).order_by(Client.full_name).all()
-        for client in clients:
-            ws.append([
+        clients = self.db.query(
+            Client.id,
+            Client.full_name,
+            Client.phone,
+            Client.whatsapp,
+            Client.address,
+            Client.notes,
+            Client.created_at
+        ).order_by(Client.full_name).yield_per(EXPORT_BATCH_SIZE)
+        rows = (
+            [
                 client.id,
                 client.full_name,
                 client.phone,
                 client.whatsapp,
                 client.address,
                 client.notes,
-                client.created_at.strftime("%Y-%m-%d %H:%M") if client.created_at else ""
-            ])
-
-        self._auto_width(ws)
-        
-        output = BytesIO()
-        wb.save(output)
-        return output.getvalue()
-
-    def export_dresses(self) -> bytes:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Dresses"
+                self._fmt_datetime(client.created_at)
+            ]
+            for client in clients
+        )
+        self._write_sheet(wb, "Clients", headers, rows)
+        return self._save(wb)
 
+    def export_dresses(self) -> IO[bytes]:
+        wb = Workbook(write_only=True)
         headers = ["ID", "Name", "Category", "Size", "Color", "Rental Price (DZD)", "Deposit (DZD)", "Status", "Description", "Created At"]
-        ws.append(headers)
-        self._style_header(ws)
 
-        dresses = self.db.query(Dress).order_by(Dress.name).all()
-        for dress in dresses:
-            ws.append([
+        dresses = self.db.query(
+            Dress.id,
+            Dress.name,
+            Dress.category,
+            Dress.size,
+            Dress.color,
+            Dress.rental_price,
+            Dress.deposit_amount,
+            Dress.status,
+            Dress.description,
+            Dress.created_at
+        ).order_by(Dress.name).yield_per(EXPORT_BATCH_SIZE)
+        rows = (
+            [
                 dress.id,
                 dress.name,
                 dress.category,
@@ -95,27 +177,30 @@ class ExcelService:
                 float(dress.deposit_amount),
                 dress.status,
                 dress.description,
-                dress.created_at.strftime("%Y-%m-%d %H:%M") if dress.created_at else ""
-            ])
-
-        self._auto_width(ws)
-        
-        output = BytesIO()
-        wb.save(output)
-        return output.getvalue()
-
-    def export_clothing(self) -> bytes:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Clothing"
+                self._fmt_datetime(dress.created_at)
+            ]
+            for dress in dresses
+        )
+        self._write_sheet(wb, "Dresses", headers, rows)
+        return self._save(wb)
 
+    def export_clothing(self) -> IO[bytes]:
+        wb = Workbook(write_only=True)
         headers = ["ID", "Name", "Category", "Size", "Color", "Sale Price (DZD)", "Stock Quantity", "Description", "Created At"]
-        ws.append(headers)
-        self._style_header(ws)
 
-        items = self.db.query(Clothing).order_by(Clothing.name).all()
-        for item in items:
-            ws.append([
+        items = self.db.query(
+            Clothing.id,
+            Clothing.name,
+            Clothing.category,
+            Clothing.size,
+            Clothing.color,
+            Clothing.sale_price,
+            Clothing.stock_quantity,
+            Clothing.description,
+            Clothing.created_at
+        ).order_by(Clothing.name).yield_per(EXPORT_BATCH_SIZE)
+        rows = (
+            [
                 item.id,
                 item.name,
                 item.category,
@@ -124,274 +209,264 @@ class ExcelService:
                 float(item.sale_price),
                 item.stock_quantity,
                 item.description,
-                item.created_at.strftime("%Y-%m-%d %H:%M") if item.created_at else ""
-            ])
-
-        self._auto_width(ws)
-        
-        output = BytesIO()
-        wb.save(output)
-        return output.getvalue()
-
-    def export_bookings(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> bytes:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Bookings"
+                self._fmt_datetime(item.created_at)
+            ]
+            for item in items
+        )
+        self._write_sheet(wb, "Clothing", headers, rows)
+        return self._save(wb)
 
+    def export_bookings(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> IO[bytes]:
+        wb = Workbook(write_only=True)
         headers = ["ID", "Client", "Dress", "Start Date", "End Date", "Rental Price (DZD)", "Deposit (DZD)", "Deposit Status", "Booking Status", "Notes", "Created At"]
-        ws.append(headers)
-        self._style_header(ws)
 
-        query = self.db.query(Booking)
+        query = self._booking_rows(
+            Booking.id,
+            Booking.deposit_status,
+            Booking.notes,
+            Booking.created_at
+        )
         if start_date:
             query = query.filter(Booking.start_date >= start_date)
         if end_date:
             query = query.filter(Booking.end_date <= end_date)
-        
-        bookings = query.order_by(Booking.start_date.desc()).all()
-        for booking in bookings:
-            ws.append([
+
+        bookings = query.order_by(Booking.start_date.desc()).yield_per(EXPORT_BATCH_SIZE)
+        rows = (
+            [
                 booking.id,
-                booking.client.full_name if booking.client else "",
-                booking.dress.name if booking.dress else "",
-                booking.start_date.strftime("%Y-%m-%d") if booking.start_date else "",
-                booking.end_date.strftime("%Y-%m-%d") if booking.end_date else "",
+                booking.client_name or "",
+                booking.dress_name or "",
+                self._fmt_date(booking.start_date),
+                self._fmt_date(booking.end_date),
                 float(booking.rental_price),
                 float(booking.deposit_amount),
                 booking.deposit_status,
                 booking.booking_status,
                 booking.notes,
-                booking.created_at.strftime("%Y-%m-%d %H:%M") if booking.created_at else ""
-            ])
-
-        self._auto_width(ws)
-        
-        output = BytesIO()
-        wb.save(output)
-        return output.getvalue()
-
-    def export_sales(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> bytes:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Sales"
+                self._fmt_datetime(booking.created_at)
+            ]
+            for booking in bookings
+        )
+        self._write_sheet(wb, "Bookings", headers, rows)
+        return self._save(wb)
 
+    def export_sales(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> IO[bytes]:
+        wb = Workbook(write_only=True)
         headers = ["ID", "Client", "Item", "Quantity", "Unit Price (DZD)", "Total Price (DZD)", "Sale Date", "Notes", "Created At"]
-        ws.append(headers)
-        self._style_header(ws)
 
-        query = self.db.query(Sale)
+        query = self._sale_rows(
+            Sale.id,
+            Sale.notes,
+            Sale.created_at
+        )
         if start_date:
             query = query.filter(Sale.sale_date >= start_date)
         if end_date:
             query = query.filter(Sale.sale_date <= end_date)
-        
-        sales = query.order_by(Sale.sale_date.desc()).all()
-        for sale in sales:
-            ws.append([
+
+        sales = query.order_by(Sale.sale_date.desc()).yield_per(EXPORT_BATCH_SIZE)
+        rows = (
+            [
                 sale.id,
-                sale.client.full_name if sale.client else "",
-                sale.clothing.name if sale.clothing else "",
+                sale.client_name or "",
+                sale.item_name or "",
                 sale.quantity,
                 float(sale.unit_price),
                 float(sale.total_price),
-                sale.sale_date.strftime("%Y-%m-%d") if sale.sale_date else "",
+                self._fmt_date(sale.sale_date),
                 sale.notes,
-                sale.created_at.strftime("%Y-%m-%d %H:%M") if sale.created_at else ""
-            ])
+                self._fmt_datetime(sale.created_at)
+            ]
+            for sale in sales
+        )
+        self._write_sheet(wb, "Sales", headers, rows)
+        return self._save(wb)
+
+    def export_commercial_report(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> IO[bytes]:
+        wb = Workbook(write_only=True)
 
-        self._auto_width(ws)
-        
-        output = BytesIO()
-        wb.save(output)
-        return output.getvalue()
-
-    def export_commercial_report(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> bytes:
-        wb = Workbook()
-        
-        # Summary Sheet
-        ws_summary = wb.active
-        ws_summary.title = "Summary"
-        
         if not end_date:
             end_date = date.today()
         if not start_date:
             start_date = date(end_date.year, 1, 1)  # Start of year
-        
-        # Calculate totals
-        from sqlalchemy import func
-        
-        rental_total = self.db.query(func.sum(Booking.rental_price)).filter(
-            Booking.start_date >= start_date,
-            Booking.start_date <= end_date,
-            Booking.booking_status != "cancelled"
-        ).scalar() or 0
-        
-        sales_total = self.db.query(func.sum(Sale.total_price)).filter(
-            Sale.sale_date >= start_date,
-            Sale.sale_date <= end_date
-        ).scalar() or 0
-        
-        booking_count = self.db.query(Booking).filter(
-            Booking.start_date >= start_date,
-            Booking.start_date <= end_date,
-            Booking.booking_status != "cancelled"
-        ).count()
-        
-        sales_count = self.db.query(Sale).filter(
-            Sale.sale_date >= start_date,
-            Sale.sale_date <= end_date
-        ).count()
-        
-        ws_summary.append(["Commercial Report"])
-        ws_summary.append([f"Period: {start_date} to {end_date}"])
-        ws_summary.append([])
-        ws_summary.append(["Metric", "Value"])
-        self._style_header(ws_summary, 4)
-        ws_summary.append(["Total Rental Revenue (DZD)", float(rental_total)])
-        ws_summary.append(["Total Sales Revenue (DZD)", float(sales_total)])
-        ws_summary.append(["Total Revenue (DZD)", float(rental_total + sales_total)])
-        ws_summary.append(["Number of Bookings", booking_count])
-        ws_summary.append(["Number of Sales", sales_count])
-        
-        self._auto_width(ws_summary)
-        
+
+        # Summary Sheet, totals from the daily revenue rollup
+        totals = revenue_totals(self.db, start_date, end_date)
+        rental_total = totals.rentals
+        sales_total = totals.sales
+
+        ws_summary = wb.create_sheet("Summary")
+        summary_rows = [
+            ["Total Rental Revenue (DZD)", float(rental_total)],
+            ["Total Sales Revenue (DZD)", float(sales_total)],
+            ["Total Revenue (DZD)", float(rental_total + sales_total)],
+            ["Number of Bookings", totals.booking_count],
+            ["Number of Sales", totals.sale_count],
+        ]
+        title_rows = [["Commercial Report"], [f"Period: {start_date} to {end_date}"], []]
+        self._set_widths(ws_summary, title_rows[1:] + [["Metric", "Value"]] + summary_rows)
+        for row in title_rows:
+            ws_summary.append(row)
+        ws_summary.append(self._header_row(ws_summary, ["Metric", "Value"]))
+        for row in summary_rows:
+            ws_summary.append(row)
+
         # Bookings Sheet
-        ws_bookings = wb.create_sheet("Bookings")
-        headers = ["Client", "Dress", "Start Date", "End Date", "Price (DZD)", "Deposit (DZD)", "Status"]
-        ws_bookings.append(headers)
-        self._style_header(ws_bookings)
-        
-        bookings = self.db.query(Booking).filter(
+        bookings = self._booking_rows().filter(
             Booking.start_date >= start_date,
             Booking.start_date <= end_date
-        ).order_by(Booking.start_date.desc()).all()
-        
-        for booking in bookings:
-            ws_bookings.append([
-                booking.client.full_name if booking.client else "",
-                booking.dress.name if booking.dress else "",
-                booking.start_date.strftime("%Y-%m-%d"),
-                booking.end_date.strftime("%Y-%m-%d"),
-                float(booking.rental_price),
-                float(booking.deposit_amount),
-                booking.booking_status
-            ])
-        
-        self._auto_width(ws_bookings)
-        
+        ).order_by(Booking.start_date.desc()).yield_per(EXPORT_BATCH_SIZE)
+        self._write_sheet(
+            wb,
+            "Bookings",
+            ["Client", "Dress", "Start Date", "End Date", "Price (DZD)", "Deposit (DZD)", "Status"],
+            (
+                [
+                    booking.client_name or "",
+                    booking.dress_name or "",
+                    self._fmt_date(booking.start_date),
+                    self._fmt_date(booking.end_date),
+                    float(booking.rental_price),
+                    float(booking.deposit_amount),
+                    booking.booking_status
+                ]
+                for booking in bookings
+            )
+        )
+
         # Sales Sheet
-        ws_sales = wb.create_sheet("Sales")
-        headers = ["Client", "Item", "Quantity", "Unit Price (DZD)", "Total (DZD)", "Date"]
-        ws_sales.append(headers)
-        self._style_header(ws_sales)
-        
-        sales = self.db.query(Sale).filter(
+        sales = self._sale_rows().filter(
             Sale.sale_date >= start_date,
             Sale.sale_date <= end_date
-        ).order_by(Sale.sale_date.desc()).all()
-        
-        for sale in sales:
-            ws_sales.append([
-                sale.client.full_name if sale.client else "",
-                sale.clothing.name if sale.clothing else "",
-                sale.quantity,
-                float(sale.unit_price),
-                float(sale.total_price),
-                sale.sale_date.strftime("%Y-%m-%d")
-            ])
-        
-        self._auto_width(ws_sales)
-        
-        output = BytesIO()
-        wb.save(output)
-        return output.getvalue()
+        ).order_by(Sale.sale_date.desc()).yield_per(EXPORT_BATCH_SIZE)
+        self._write_sheet(
+            wb,
+            "Sales",
+            ["Client", "Item", "Quantity", "Unit Price (DZD)", "Total (DZD)", "Date"],
+            (
+                [
+                    sale.client_name or "",
+                    sale.item_name or "",
+                    sale.quantity,
+                    float(sale.unit_price),
+                    float(sale.total_price),
+                    self._fmt_date(sale.sale_date)
+                ]
+                for sale in sales
+            )
+        )
 
-    def import_clients(self, file_contents: bytes) -> dict:
-        wb = load_workbook(filename=BytesIO(file_contents))
-        ws = wb.active
-        
-        imported = 0
-        errors = []
-        
-        rows = list(ws.iter_rows(min_row=2, values_only=True))
-        for idx, row in enumerate(rows, start=2):
-            try:
-                if not row[1]:  # Skip if no name
-                    continue
-                    
-                client = Client(
-                    full_name=str(row[1]) if row[1] else "",
-                    phone=str(row[2]) if row[2] else None,
-                    whatsapp=str(row[3]) if row[3] else None,
-                    address=str(row[4]) if row[4] else None,
-                    notes=str(row[5]) if row[5] else None
-                )
-                self.db.add(client)
-                imported += 1
-            except Exception as e:
-                errors.append(f"Row {idx}: {str(e)}")
-        
-        self.db.commit()
-        return {"imported": imported, "errors": errors}
+        return self._save(wb)
+
+    def _bulk_import(self, source: Union[bytes, IO[bytes]], model, parse_row, width: int) -> dict:
+        """
+        Stream rows from the first sheet in read-only mode, validate each one
+        with parse_row (None skips the row) and insert valid rows in batches.
+        """
+        if isinstance(source, bytes):
+            source = BytesIO(source)
+        wb = load_workbook(filename=source, read_only=True, data_only=True)
 
-    def import_dresses(self, file_contents: bytes) -> dict:
-        wb = load_workbook(filename=BytesIO(file_contents))
-        ws = wb.active
-        
         imported = 0
         errors = []
-        
-        rows = list(ws.iter_rows(min_row=2, values_only=True))
-        for idx, row in enumerate(rows, start=2):
-            try:
-                if not row[1]:  # Skip if no name
+        chunk = []
+        try:
+            ws = wb.active
+            for idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+                # Read-only rows stop at the last non-empty cell
+                row = tuple(row) + (None,) * (width - len(row))
+                try:
+                    values = parse_row(row)
+                except Exception as e:
+                    errors.append(f"Row {idx}: {str(e)}")
+                    continue
+                if values is None:
                     continue
-                    
-                dress = Dress(
-                    name=str(row[1]) if row[1] else "",
-                    category=str(row[2]) if row[2] else "Other",
-                    size=str(row[3]) if row[3] else "M",
-                    color=str(row[4]) if row[4] else "White",
-                    rental_price=float(row[5]) if row[5] else 0,
-                    deposit_amount=float(row[6]) if row[6] else 0,
-                    status=str(row[7]) if row[7] else "available",
-                    description=str(row[8]) if row[8] else None
-                )
-                self.db.add(dress)
-                imported += 1
-            except Exception as e:
-                errors.append(f"Row {idx}: {str(e)}")
-        
+
+                chunk.append((idx, values))
+                if len(chunk) >= IMPORT_BATCH_SIZE:
+                    imported += self._insert_chunk(model, chunk, errors)
+                    chunk = []
+
+            if chunk:
+                imported += self._insert_chunk(model, chunk, errors)
+        finally:
+            wb.close()
+
         self.db.commit()
         return {"imported": imported, "errors": errors}
 
-    def import_clothing(self, file_contents: bytes) -> dict:
-        wb = load_workbook(filename=BytesIO(file_contents))
-        ws = wb.active
-        
-        imported = 0
-        errors = []
-        
-        rows = list(ws.iter_rows(min_row=2, values_only=True))
-        for idx, row in enumerate(rows, start=2):
+    def _insert_chunk(self, model, chunk: list, errors: list) -> int:
+        """Multi-row INSERT for a chunk; row by row only if the database rejects it"""
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(model), [values for _, values in chunk])
+            return len(chunk)
+        except SQLAlchemyError:
+            pass
+
+        inserted = 0
+        for idx, values in chunk:
             try:
-                if not row[1]:  # Skip if no name
-                    continue
-                    
-                item = Clothing(
-                    name=str(row[1]) if row[1] else "",
-                    category=str(row[2]) if row[2] else "Other",
-                    size=str(row[3]) if row[3] else "M",
-                    color=str(row[4]) if row[4] else "Black",
-                    sale_price=float(row[5]) if row[5] else 0,
-                    stock_quantity=int(row[6]) if row[6] else 0,
-                    description=str(row[7]) if row[7] else None
-                )
-                self.db.add(item)
-                imported += 1
-            except Exception as e:
-                errors.append(f"Row {idx}: {str(e)}")
-        
-        self.db.commit()
-        return {"imported": imported, "errors": errors}
+                with self.db.begin_nested():
+                    self.db.execute(insert(model), [values])
+                inserted += 1
+            except SQLAlchemyError as e:
+                errors.append(f"Row {idx}: {str(getattr(e, 'orig', None) or e)}")
+        return inserted
+
+    @staticmethod
+    def _parse_client(row) -> Optional[dict]:
+        if not row[1]:  # Skip if no name
+            return None
+        return {
+            "full_name": str(row[1]),
+            "full_name_normalized": normalize_text(str(row[1])),
+            "phone": str(row[2]) if row[2] else None,
+            "phone_e164": normalize_phone(str(row[2])) if row[2] else None,
+            "whatsapp": str(row[3]) if row[3] else None,
+            "whatsapp_e164": normalize_phone(str(row[3])) if row[3] else None,
+            "address": str(row[4]) if row[4] else None,
+            "notes": str(row[5]) if row[5] else None
+        }
+
+    @staticmethod
+    def _parse_dress(row) -> Optional[dict]:
+        if not row[1]:  # Skip if no name
+            return None
+        return {
+            "name": str(row[1]),
+            "name_normalized": normalize_text(str(row[1])),
+            "category": str(row[2]) if row[2] else "Other",
+            "size": str(row[3]) if row[3] else "M",
+            "color": str(row[4]) if row[4] else "White",
+            "rental_price": float(row[5]) if row[5] else 0,
+            "deposit_amount": float(row[6]) if row[6] else 0,
+            "status": str(row[7]) if row[7] else "available",
+            "description": str(row[8]) if row[8] else None
+        }
+
+    @staticmethod
+    def _parse_clothing(row) -> Optional[dict]:
+        if not row[1]:  # Skip if no name
+            return None
+        return {
+            "name": str(row[1]),
+            "name_normalized": normalize_text(str(row[1])),
+            "category": str(row[2]) if row[2] else "Other",
+            "size": str(row[3]) if row[3] else "M",
+            "color": str(row[4]) if row[4] else "Black",
+            "sale_price": float(row[5]) if row[5] else 0,
+            "stock_quantity": int(row[6]) if row[6] else 0,
+            "description": str(row[7]) if row[7] else None
+        }
+
+    def import_clients(self, source: Union[bytes, IO[bytes]]) -> dict:
+        return self._bulk_import(source, Client, self._parse_client, width=6)
+
+    def import_dresses(self, source: Union[bytes, IO[bytes]]) -> dict:
+        return self._bulk_import(source, Dress, self._parse_dress, width=9)
 
+    def import_clothing(self, source: Union[bytes, IO[bytes]]) -> dict:
+        return self._bulk_import(source, Clothing, self._parse_clothing, width=8)
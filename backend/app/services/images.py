@@ -0,0 +1,421 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from fastapi import HTTPException, UploadFile
+from PIL import Image, ImageOps
+from sqlalchemy.orm import Session
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+import argparse
+import glob
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import uuid
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Longest edge in pixels per variant; smaller originals are never upscaled
+VARIANT_SIZES = {"thumb": 320, "medium": 960, "full": 2048}
+LOGO_SIZE = 512
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+# Uploads are copied to disk this much at a time
+CHUNK_SIZE = 1024 * 1024
+
+# Image rows the backfill updates per commit
+BACKFILL_BATCH = 50
+
+# Dress and clothing images live under uploads/objects/ named by the SHA-256
+# of their bytes, so identical photos share one file and a URL never changes
+OBJECTS_DIR = "objects"
+
+# Saving uploads and generating variants runs here. Pillow and file I/O
+# release the GIL, so a few threads keep several uploads busy at once
+image_pool = ThreadPoolExecutor(max_workers=settings.image_workers, thread_name_prefix="images")
+
+# Guards placing and removing objects. _pending counts uploads holding an
+# object whose image rows are not committed yet, so a concurrent delete of
+# the last committed row does not remove the file from under them
+_refs_lock = threading.Lock()
+_pending: Counter = Counter()
+
+
+class StoredImage(NamedTuple):
+    image_path: str
+    variants: Optional[dict]
+    content_hash: Optional[str]  # None for images stored before content addressing
+
+    @classmethod
+    def of(cls, image) -> "StoredImage":
+        """Snapshot of a DressImage/ClothingImage row, usable after it is deleted"""
+        return cls(image.image_path, image.variants, image.content_hash)
+
+
+def disk_path(url: str) -> str:
+    """Filesystem path of an /uploads/... URL"""
+    return os.path.join(settings.upload_dir, url.replace("/uploads/", "", 1))
+
+
+def object_url(digest: str, suffix: str) -> str:
+    """URL of a content-addressed file, fanned out over two directory levels"""
+    return f"/uploads/{OBJECTS_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+
+
+def _extension(filename: str) -> str:
+    ext = filename.rsplit(".", 1)[-1].lower()
+    return "jpg" if ext == "jpeg" else ext
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """JPEG has no alpha: composite transparent images onto white"""
+    if image.mode == "RGB":
+        return image
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+    return background
+
+
+def _save_atomically(image: Image.Image, path: str, image_format: str, **params):
+    # Two uploads of the same photo may render the same variant at once
+    partial = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        image.save(partial, image_format, **params)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def generate_variants(source: str, digest: str, force: bool = False) -> dict:
+    """
+    Thumb/medium/full renditions of the object `digest` as WebP and JPEG,
+    written next to it. EXIF orientation is applied to the pixels and no
+    metadata is written. Renditions already on disk are reused unless forced.
+    """
+    urls = {
+        name: (object_url(digest, f"_{name}.webp"), object_url(digest, f"_{name}.jpg"))
+        for name in VARIANT_SIZES
+    }
+
+    if not force and all(os.path.exists(disk_path(url)) for pair in urls.values() for url in pair):
+        variants = {}
+        for name, (webp, jpeg) in urls.items():
+            with Image.open(disk_path(webp)) as rendition:
+                width, height = rendition.size
+            variants[name] = {"webp": webp, "jpeg": jpeg, "width": width, "height": height}
+        return variants
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.mode in ("LA", "P", "PA") else "RGB")
+
+        variants = {}
+        for name, size in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+            webp, jpeg = urls[name]
+            _save_atomically(resized, disk_path(webp), "WEBP", quality=WEBP_QUALITY, method=4, exif=b"")
+            _save_atomically(
+                _flatten(resized), disk_path(jpeg), "JPEG",
+                quality=JPEG_QUALITY, optimize=True, progressive=True, exif=b""
+            )
+
+            variants[name] = {"webp": webp, "jpeg": jpeg, "width": resized.width, "height": resized.height}
+    return variants
+
+
+def normalize_logo(path: str):
+    """
+    Rewrite a logo in its own format with orientation applied, EXIF dropped
+    and the longest edge capped at LOGO_SIZE. Kept as PNG/JPEG rather than
+    split into variants since receipts embed the file directly.
+    """
+    with Image.open(path) as original:
+        image_format = original.format
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((LOGO_SIZE, LOGO_SIZE), Image.Resampling.LANCZOS)
+        image.save(path, image_format, exif=b"")
+
+
+def _generate_or_log(source: str, digest: str, force: bool = False) -> Optional[dict]:
+    try:
+        return generate_variants(source, digest, force)
+    except Exception as e:
+        # Keep the original; grids fall back to it until a backfill succeeds
+        logger.warning(f"Could not generate variants for {source}: {e}")
+        return None
+
+
+def _too_large(upload: UploadFile) -> HTTPException:
+    limit = settings.max_file_size / (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"{upload.filename} is larger than {limit:g} MB")
+
+
+def save_upload(upload: UploadFile, filepath: str) -> str:
+    """
+    Copy an upload to `filepath` in CHUNK_SIZE pieces, so memory stays flat
+    whatever the file size, and refuse it once it passes max_file_size. The
+    file only appears under its final name when complete. Returns the
+    SHA-256 hex digest of the content.
+    """
+    if upload.size is not None and upload.size > settings.max_file_size:
+        raise _too_large(upload)
+
+    partial = f"{filepath}.part"
+    written = 0
+    sha256 = hashlib.sha256()
+    try:
+        upload.file.seek(0)
+        with open(partial, "wb") as f:
+            while chunk := upload.file.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > settings.max_file_size:
+                    raise _too_large(upload)
+                sha256.update(chunk)
+                f.write(chunk)
+        os.replace(partial, filepath)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return sha256.hexdigest()
+
+
+def _place_object(source: str, digest: str, ext: str) -> str:
+    """
+    Move `source` to the object path of `digest`, or drop it when that
+    content is already stored. Caller holds _refs_lock.
+    """
+    image_path = object_url(digest, f".{ext}")
+    target = disk_path(image_path)
+    if os.path.exists(target):
+        os.remove(source)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source, target)
+    return image_path
+
+
+def _store_one(upload: UploadFile, ext: str) -> StoredImage:
+    incoming = os.path.join(settings.upload_dir, OBJECTS_DIR, f"incoming_{uuid.uuid4().hex}")
+    digest = save_upload(upload, incoming)
+    with _refs_lock:
+        image_path = _place_object(incoming, digest, ext)
+        _pending[digest] += 1
+    return StoredImage(image_path, _generate_or_log(disk_path(image_path), digest), digest)
+
+
+def _unpend(stored: Iterable[StoredImage]):
+    with _refs_lock:
+        for image in stored:
+            _pending[image.content_hash] -= 1
+            if not _pending[image.content_hash]:
+                del _pending[image.content_hash]
+
+
+@contextmanager
+def store_uploads(db: Session, images: List[UploadFile]) -> Iterator[List[StoredImage]]:
+    """
+    Save uploaded originals as content-addressed objects and build their
+    variants, one file per image pool worker. Files with a disallowed
+    extension are skipped; if any file fails (e.g. too large) nothing is kept.
+
+    Image rows for the yielded files must be committed inside the block:
+    the objects are protected from concurrent deletes until it exits, and
+    any left unreferenced (e.g. on rollback) are removed then.
+    """
+    accepted = []
+    for image in images:
+        if not image.filename:
+            continue
+        ext = _extension(image.filename)
+        if ext not in settings.allowed_extensions:
+            continue
+        # Reject oversized files up front when the size is known, before any write
+        if image.size is not None and image.size > settings.max_file_size:
+            raise _too_large(image)
+        accepted.append((image, ext))
+
+    futures = [image_pool.submit(_store_one, image, ext) for image, ext in accepted]
+    wait(futures)
+    stored = [future.result() for future in futures if not future.exception()]
+
+    try:
+        for future in futures:
+            if future.exception():
+                raise future.exception()
+        yield stored
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        _unpend(stored)
+        release_images(db, stored)
+
+
+def _reference_count(db: Session, digest: str) -> int:
+    from ..models.clothing import ClothingImage
+    from ..models.dress import DressImage
+
+    return sum(
+        db.query(model.id).filter(model.content_hash == digest).count()
+        for model in (DressImage, ClothingImage)
+    )
+
+
+def remove_image_files(image_path: str, variants: Optional[dict]):
+    """Delete an original and its variant files from disk"""
+    paths = [image_path] if image_path else []
+    for rendition in (variants or {}).values():
+        paths += [rendition["webp"], rendition["jpeg"]]
+    for url in paths:
+        filepath = disk_path(url)
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def release_images(db: Session, images: Iterable[StoredImage]):
+    """
+    Remove the files of images whose rows are gone, once no dress_images or
+    clothing_images row and no upload in flight refers to their content.
+    Call after the deleting transaction has committed.
+    """
+    with _refs_lock:
+        for digest in {image.content_hash for image in images if image.content_hash}:
+            if _pending[digest] or _reference_count(db, digest):
+                continue
+            prefix = disk_path(object_url(digest, ""))
+            for filepath in glob.glob(f"{glob.escape(prefix)}*"):
+                os.remove(filepath)
+        # Files from before content addressing belong to a single row each
+        for image in images:
+            if not image.content_hash:
+                remove_image_files(image.image_path, image.variants)
+
+
+def _hash_file(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _link_object(source: str, digest: str, ext: str) -> str:
+    """
+    Hard-link (or copy) `source` to the object path of `digest`, leaving the
+    source in place until the row pointing at it has moved on.
+    """
+    image_path = object_url(digest, f".{ext}")
+    target = disk_path(image_path)
+    with _refs_lock:
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            partial = f"{target}.{uuid.uuid4().hex}.part"
+            try:
+                try:
+                    os.link(source, partial)
+                except OSError:
+                    shutil.copyfile(source, partial)
+                os.replace(partial, target)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+    return image_path
+
+
+def _backfill_one(image: StoredImage, force: bool) -> Optional[StoredImage]:
+    image_path, variants, digest = image
+    if digest is None:
+        # A uuid-named original gets an object; its old files stay until committed
+        source = disk_path(image_path)
+        if not os.path.exists(source):
+            logger.warning(f"Missing original {source}")
+            return None
+        digest = _hash_file(source)
+        image_path = _link_object(source, digest, _extension(source))
+        variants = None
+    if variants is None or force:
+        variants = _generate_or_log(disk_path(image_path), digest, force)
+    return StoredImage(image_path, variants, digest)
+
+
+def backfill_variants(db: Session, force: bool = False) -> dict:
+    """
+    Move images stored before content addressing into the object store and
+    generate variants for images that have none (or all, with force).
+
+    Rows are committed every BACKFILL_BATCH images and the legacy files of a
+    batch are only removed after its commit, so an interrupted run leaves
+    every row pointing at a file that exists and can simply be rerun.
+    """
+    from ..models.clothing import ClothingImage
+    from ..models.dress import DressImage
+
+    counts = {}
+    for model in (DressImage, ClothingImage):
+        query = db.query(model.id, model.image_path, model.variants, model.content_hash)
+        if not force:
+            query = query.filter((model.variants.is_(None)) | (model.content_hash.is_(None)))
+        rows = query.order_by(model.id).all()
+
+        jobs = []
+        for row in rows:
+            current = StoredImage(row.image_path, row.variants, row.content_hash)
+            jobs.append((row.id, current, image_pool.submit(_backfill_one, current, force)))
+
+        done = 0
+        replaced = []
+        for position, (image_id, current, future) in enumerate(jobs, 1):
+            try:
+                image = future.result()
+            except Exception as e:
+                logger.warning(f"Could not backfill {model.__tablename__} {image_id}: {e}")
+                image = None
+            if image:
+                db.query(model).filter(model.id == image_id).update(
+                    image._asdict(), synchronize_session=False
+                )
+                if image.variants:
+                    done += 1
+                if current.content_hash is None:
+                    replaced.append(current)
+
+            if position % BACKFILL_BATCH == 0 or position == len(jobs):
+                db.commit()
+                for legacy in replaced:
+                    remove_image_files(legacy.image_path, legacy.variants)
+                replaced = []
+        counts[model.__tablename__] = {"candidates": len(rows), "generated": done}
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Image storage maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill = subparsers.add_parser(
+        "backfill", help="Move existing images into the content-addressed store and generate their variants"
+    )
+    backfill.add_argument("--force", action="store_true", help="Regenerate images that already have variants")
+    args = parser.parse_args()
+
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        for table, counts in backfill_variants(db, args.force).items():
+            print(f"{table}: {counts['generated']} of {counts['candidates']} images processed")
+    finally:
+        db.close()
+        image_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
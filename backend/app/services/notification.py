@@ -6,6 +6,7 @@ from datetime import datetime
 from ..config import get_settings
 from ..models.notification import NotificationLog
 from ..models.client import Client as ClientModel
+from ..utils.phone import normalize_phone
 
 settings = get_settings()
 
@@ -55,7 +56,7 @@ class NotificationService:
             sms = self.twilio_client.messages.create(
                 body=message,
                 from_=settings.twilio_phone_number,
-                to=phone_number
+                to=normalize_phone(phone_number) or phone_number
             )
             
             self._log_notification(
@@ -89,8 +90,8 @@ class NotificationService:
             return {"success": False, "error": "Twilio not configured"}
         
         try:
-            # WhatsApp numbers need 'whatsapp:' prefix
-            to_number = whatsapp_number if whatsapp_number.startswith("whatsapp:") else f"whatsapp:{whatsapp_number}"
+            # WhatsApp numbers need 'whatsapp:' prefix on the E.164 number
+            to_number = f"whatsapp:{normalize_phone(whatsapp_number) or whatsapp_number.removeprefix('whatsapp:')}"
             from_number = settings.twilio_whatsapp_number if settings.twilio_whatsapp_number.startswith("whatsapp:") else f"whatsapp:{settings.twilio_whatsapp_number}"
             
             msg = self.twilio_client.messages.create(
@@ -134,9 +135,9 @@ class NotificationService:
         message = f"Bonjour {client.full_name}!\n\nVotre réservation a été confirmée:\n- Robe: {dress_name}\n- Date: {start_date} au {end_date}\n\nMerci de nous faire confiance!\n\n🌸 Wardrop"
         
         if channel == "sms" and client.phone:
-            return self.send_sms(client_id, client.phone, message, "booking_confirmation")
+            return self.send_sms(client_id, client.phone_e164 or client.phone, message, "booking_confirmation")
         elif channel == "whatsapp" and client.whatsapp:
-            return self.send_whatsapp(client_id, client.whatsapp, message, "booking_confirmation")
+            return self.send_whatsapp(client_id, client.whatsapp_e164 or client.whatsapp, message, "booking_confirmation")
         
         return {"success": False, "error": f"No {channel} number for client"}
 
@@ -155,9 +156,9 @@ class NotificationService:
         message = f"Bonjour {client.full_name}!\n\nRappel: La robe '{dress_name}' doit être retournée le {return_date}.\n\nMerci!\n\n🌸 Wardrop"
         
         if channel == "sms" and client.phone:
-            return self.send_sms(client_id, client.phone, message, "return_reminder")
+            return self.send_sms(client_id, client.phone_e164 or client.phone, message, "return_reminder")
         elif channel == "whatsapp" and client.whatsapp:
-            return self.send_whatsapp(client_id, client.whatsapp, message, "return_reminder")
+            return self.send_whatsapp(client_id, client.whatsapp_e164 or client.whatsapp, message, "return_reminder")
         
         return {"success": False, "error": f"No {channel} number for client"}
 
@@ -174,9 +175,9 @@ class NotificationService:
         message = f"Bonjour {client.full_name}!\n\nMerci d'avoir choisi Wardrop! Nous espérons que vous avez passé un moment magnifique.\n\nÀ bientôt!\n\n🌸 Wardrop"
         
         if channel == "sms" and client.phone:
-            return self.send_sms(client_id, client.phone, message, "thank_you")
+            return self.send_sms(client_id, client.phone_e164 or client.phone, message, "thank_you")
         elif channel == "whatsapp" and client.whatsapp:
-            return self.send_whatsapp(client_id, client.whatsapp, message, "thank_you")
+            return self.send_whatsapp(client_id, client.whatsapp_e164 or client.whatsapp, message, "thank_you")
         
         return {"success": False, "error": f"No {channel} number for client"}
 
@@ -0,0 +1,171 @@
+"""
+Daily revenue rollup maintenance.
+
+`daily_revenue` holds one row per day with rental income (non-cancelled
+bookings by start_date), sales income and sales cost (by sale_date). Write
+paths call `refresh_revenue_days` with the days they touched, before commit,
+so the rollup stays in the same transaction as the source rows.
+
+Each rebuild recomputes and overwrites whole days, so writers serialize on
+the days they touch (a per-day advisory lock held until commit). Otherwise
+two transactions adding the first rows of a day would each sum without the
+other's uncommitted rows and the later upsert would drop the earlier one.
+
+Backfill (rebuilds the whole table, or a date range):
+    python -m app.services.revenue backfill [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+from sqlalchemy import select, delete, func, literal, text, union_all, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Iterable, Optional, Set
+import argparse
+
+from ..models.booking import Booking
+from ..models.sale import Sale
+from ..models.clothing import Clothing
+from ..models.revenue import DailyRevenue
+
+PERIOD_UNITS = {"daily": "day", "weekly": "week", "monthly": "month", "yearly": "year"}
+
+# First key of pg_advisory_xact_lock(int, int) for rollup days ("REVD")
+DAY_LOCK_NAMESPACE = 0x52455644
+
+
+def booking_days(db: Session, *criteria) -> Set[date]:
+    """Distinct booking start dates matching the given filters"""
+    return {row[0] for row in db.query(Booking.start_date).filter(*criteria).distinct()}
+
+
+def sale_days(db: Session, *criteria) -> Set[date]:
+    """Distinct sale dates matching the given filters"""
+    return {row[0] for row in db.query(Sale.sale_date).filter(*criteria).distinct()}
+
+
+def _rebuild(db: Session, day_filter_booking, day_filter_sale, day_filter_rollup):
+    rentals = select(
+        Booking.start_date.label("day"),
+        func.sum(Booking.rental_price).label("rentals"),
+        func.count(Booking.id).label("booking_count"),
+        literal(0).label("sales"),
+        literal(0).label("sales_cost"),
+        literal(0).label("sale_count")
+    ).where(
+        Booking.booking_status != "cancelled", day_filter_booking
+    ).group_by(Booking.start_date)
+
+    sales = select(
+        Sale.sale_date.label("day"),
+        literal(0).label("rentals"),
+        literal(0).label("booking_count"),
+        func.sum(Sale.total_price).label("sales"),
+        func.coalesce(func.sum(Sale.quantity * Clothing.purchase_price), 0).label("sales_cost"),
+        func.count(Sale.id).label("sale_count")
+    ).join(
+        Clothing, Sale.clothing_id == Clothing.id
+    ).where(day_filter_sale).group_by(Sale.sale_date)
+
+    combined = union_all(rentals, sales).subquery()
+    totals = select(
+        combined.c.day,
+        func.sum(combined.c.rentals),
+        func.sum(combined.c.booking_count),
+        func.sum(combined.c.sales),
+        func.sum(combined.c.sales_cost),
+        func.sum(combined.c.sale_count)
+    ).group_by(combined.c.day)
+
+    columns = ["day", "rentals", "booking_count", "sales", "sales_cost", "sale_count"]
+    stmt = insert(DailyRevenue).from_select(columns, totals)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyRevenue.day],
+        set_={c: getattr(stmt.excluded, c) for c in columns[1:]} | {"updated_at": func.now()}
+    )
+
+    db.execute(delete(DailyRevenue).where(day_filter_rollup))
+    db.execute(stmt)
+
+
+def refresh_revenue_days(db: Session, days: Iterable[Optional[date]]):
+    """Recompute the rollup rows for the given days from bookings and sales"""
+    days = sorted({d for d in days if d is not None})
+    if not days:
+        return
+    # Sessions don't autoflush, so make pending source changes visible first
+    db.flush()
+    # Wait for other transactions rebuilding these days; sorted to avoid
+    # deadlocks. Statements after this see their committed rows
+    for day in days:
+        db.execute(select(func.pg_advisory_xact_lock(DAY_LOCK_NAMESPACE, day.toordinal())))
+    _rebuild(
+        db,
+        Booking.start_date.in_(days),
+        Sale.sale_date.in_(days),
+        DailyRevenue.day.in_(days)
+    )
+
+
+def backfill_revenue(db: Session, start: Optional[date] = None, end: Optional[date] = None):
+    """Rebuild the rollup over an optional date range (whole history by default)"""
+    def between(column):
+        return and_(
+            column >= start if start else True,
+            column <= end if end else True
+        )
+
+    # Blocks concurrent refresh_revenue_days writes until this commits, so
+    # none of them is overwritten by sums that missed its rows
+    db.execute(text("LOCK TABLE daily_revenue IN EXCLUSIVE MODE"))
+    _rebuild(db, between(Booking.start_date), between(Sale.sale_date), between(DailyRevenue.day))
+
+
+def revenue_totals(db: Session, start: date, end: Optional[date] = None):
+    """Summed rollup figures for days in [start, end] (open-ended if no end)"""
+    query = db.query(
+        func.coalesce(func.sum(DailyRevenue.rentals), 0).label("rentals"),
+        func.coalesce(func.sum(DailyRevenue.booking_count), 0).label("booking_count"),
+        func.coalesce(func.sum(DailyRevenue.sales), 0).label("sales"),
+        func.coalesce(func.sum(DailyRevenue.sales_cost), 0).label("sales_cost"),
+        func.coalesce(func.sum(DailyRevenue.sale_count), 0).label("sale_count")
+    ).filter(DailyRevenue.day >= start)
+    if end:
+        query = query.filter(DailyRevenue.day <= end)
+    return query.one()
+
+
+def revenue_by_period(db: Session, start: date, end: date, period: str):
+    """Rollup re-aggregated into day/week/month/year buckets"""
+    bucket = func.date_trunc(PERIOD_UNITS[period], DailyRevenue.day).label("period")
+    return db.query(
+        bucket,
+        func.sum(DailyRevenue.rentals).label("rentals"),
+        func.sum(DailyRevenue.sales).label("sales"),
+        func.sum(DailyRevenue.sales_cost).label("sales_cost")
+    ).filter(
+        DailyRevenue.day >= start,
+        DailyRevenue.day <= end
+    ).group_by(bucket).order_by(bucket).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily revenue rollup maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill = subparsers.add_parser("backfill", help="Rebuild daily_revenue from bookings and sales")
+    backfill.add_argument("--start", type=date.fromisoformat)
+    backfill.add_argument("--end", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        backfill_revenue(db, args.start, args.end)
+        db.commit()
+        print(f"daily_revenue rows: {db.query(DailyRevenue).count()}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,25 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import update, select
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, datetime
 import logging
+import time
 
 from ..database import SessionLocal
 from ..models.booking import Booking
 from ..models.dress import Dress
+from .availability import availability_index
+from .dashboard import invalidate_dashboard
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+# Jobs do blocking DB work, so run them on a worker thread rather than the event loop
+scheduler = AsyncIOScheduler(executors={"default": ThreadPoolExecutor(max_workers=1)})
+
+# Metrics from the most recent booking status update
+last_run: dict = {}
 
 
 def update_booking_statuses():
@@ -18,58 +27,88 @@ def update_booking_statuses():
     Update booking statuses based on dates:
     - confirmed -> in_progress when start_date <= today
     - in_progress -> completed when end_date < today
-    Also updates dress status accordingly
+    Also updates dress status accordingly.
+    
+    Each transition is a single UPDATE ... RETURNING, all in one transaction.
     """
     db: Session = SessionLocal()
+    started_at = time.perf_counter()
     try:
         today = date.today()
         logger.info(f"Running booking status update for {today}")
         
-        # Update confirmed bookings to in_progress when start_date arrives
-        confirmed_bookings = db.query(Booking).filter(
-            Booking.booking_status == "confirmed",
-            Booking.start_date <= today
+        # confirmed -> in_progress, and mark those dresses as rented
+        started = db.execute(
+            update(Booking)
+            .where(Booking.booking_status == "confirmed", Booking.start_date <= today)
+            .values(booking_status="in_progress")
+            .returning(Booking.id, Booking.dress_id)
+            .execution_options(synchronize_session=False)
         ).all()
         
-        for booking in confirmed_bookings:
-            booking.booking_status = "in_progress"
-            # Update dress status to rented
-            dress = db.query(Dress).filter(Dress.id == booking.dress_id).first()
-            if dress:
-                dress.status = "rented"
-            logger.info(f"Booking {booking.id} changed to in_progress")
+        rented_dresses = []
+        if started:
+            rented_dresses = db.execute(
+                update(Dress)
+                .where(Dress.id.in_(sorted({row.dress_id for row in started})))
+                .values(status="rented")
+                .returning(Dress.id)
+                .execution_options(synchronize_session=False)
+            ).all()
         
-        # Update in_progress bookings to completed when end_date passes
-        in_progress_bookings = db.query(Booking).filter(
-            Booking.booking_status == "in_progress",
-            Booking.end_date < today
+        # in_progress -> completed
+        completed = db.execute(
+            update(Booking)
+            .where(Booking.booking_status == "in_progress", Booking.end_date < today)
+            .values(booking_status="completed")
+            .returning(Booking.id, Booking.dress_id)
+            .execution_options(synchronize_session=False)
         ).all()
         
-        for booking in in_progress_bookings:
-            booking.booking_status = "completed"
-            
-            # Check if dress has other active bookings
-            dress = db.query(Dress).filter(Dress.id == booking.dress_id).first()
-            if dress:
-                # Check for other active bookings on this dress
-                other_active = db.query(Booking).filter(
-                    Booking.dress_id == booking.dress_id,
-                    Booking.id != booking.id,
-                    Booking.booking_status.in_(["confirmed", "in_progress"]),
-                    Booking.start_date <= today,
-                    Booking.end_date >= today
-                ).count()
-                
-                if other_active == 0:
-                    dress.status = "available"
-            logger.info(f"Booking {booking.id} changed to completed")
+        # Free dresses of completed bookings unless another booking is active today
+        released_dresses = []
+        if completed:
+            other_active = select(Booking.id).where(
+                Booking.dress_id == Dress.id,
+                Booking.booking_status.in_(["confirmed", "in_progress"]),
+                Booking.start_date <= today,
+                Booking.end_date >= today
+            ).exists()
+            released_dresses = db.execute(
+                update(Dress)
+                .where(Dress.id.in_(sorted({row.dress_id for row in completed})), ~other_active)
+                .values(status="available")
+                .returning(Dress.id)
+                .execution_options(synchronize_session=False)
+            ).all()
         
         db.commit()
-        logger.info(f"Booking status update complete. Updated {len(confirmed_bookings)} to in_progress, {len(in_progress_bookings)} to completed")
+        invalidate_dashboard()
+        
+        # Transitions keep bookings occupying their dates; the daily reload
+        # slides the history window forward and clears any drift
+        if availability_index.enabled:
+            availability_index.rebuild()
+        
+        last_run.update({
+            "ran_at": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+            "bookings_started": len(started),
+            "bookings_completed": len(completed),
+            "dresses_rented": len(rented_dresses),
+            "dresses_released": len(released_dresses),
+            "error": None
+        })
+        logger.info(f"Booking status update complete: {last_run}")
         
     except Exception as e:
         logger.error(f"Error updating booking statuses: {e}")
         db.rollback()
+        last_run.update({
+            "ran_at": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+            "error": str(e)
+        })
     finally:
         db.close()
 
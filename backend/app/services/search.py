@@ -0,0 +1,179 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, aliased
+from typing import Callable, Dict, List, Optional
+import html
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.booking import Booking
+from ..models.client import Client
+from ..models.clothing import Clothing
+from ..models.dress import Dress
+from ..models.sale import Sale
+from ..utils.cache import TTLCache
+from ..utils.search import text_search
+from ..utils.text import highlight
+
+settings = get_settings()
+
+# Recent results per (normalized query, limit); typing a name repeats prefixes
+search_cache = TTLCache(maxsize=settings.search_cache_size, ttl=settings.search_cache_ttl)
+
+
+def _snippet(q: str, *fields: Optional[str]) -> str:
+    """Highlight of the first field containing the query, else the first field"""
+    for value in fields:
+        snippet = highlight(value, q)
+        if snippet:
+            return snippet
+    return html.escape(fields[0] or "")
+
+
+def _matching_ids(column, q: str):
+    """
+    Ids of rows whose normalized name matches, from the trigram index. Joined
+    entities are filtered by these sets so bookings and sales are reached
+    through their foreign key indexes rather than by scanning the join.
+    """
+    entity = aliased(column.class_)
+    normalized = getattr(entity, column.key)
+    search_filter, _ = text_search(q, [normalized])
+    return select(entity.id).where(search_filter)
+
+
+def search_clients(db: Session, q: str, limit: int) -> List[dict]:
+    search_filter, rank = text_search(q, [Client.full_name_normalized], [Client.phone, Client.whatsapp])
+    rows = db.query(
+        Client.id, Client.full_name, Client.phone, Client.whatsapp
+    ).filter(search_filter).order_by(rank.desc(), Client.id.desc()).limit(limit).all()
+    return [
+        {
+            "id": row.id,
+            "title": row.full_name,
+            "subtitle": row.phone or row.whatsapp,
+            "snippet": _snippet(q, row.full_name, row.phone, row.whatsapp)
+        }
+        for row in rows
+    ]
+
+
+def search_dresses(db: Session, q: str, limit: int) -> List[dict]:
+    search_filter, rank = text_search(q, [Dress.name_normalized], [Dress.description])
+    rows = db.query(
+        Dress.id, Dress.name, Dress.category, Dress.size, Dress.description
+    ).filter(search_filter).order_by(rank.desc(), Dress.id.desc()).limit(limit).all()
+    return [
+        {
+            "id": row.id,
+            "title": row.name,
+            "subtitle": f"{row.category} - {row.size}",
+            "snippet": _snippet(q, row.name, row.description)
+        }
+        for row in rows
+    ]
+
+
+def search_clothing(db: Session, q: str, limit: int) -> List[dict]:
+    search_filter, rank = text_search(q, [Clothing.name_normalized], [Clothing.description])
+    rows = db.query(
+        Clothing.id, Clothing.name, Clothing.category, Clothing.size, Clothing.description
+    ).filter(search_filter).order_by(rank.desc(), Clothing.id.desc()).limit(limit).all()
+    return [
+        {
+            "id": row.id,
+            "title": row.name,
+            "subtitle": f"{row.category} - {row.size}",
+            "snippet": _snippet(q, row.name, row.description)
+        }
+        for row in rows
+    ]
+
+
+def search_bookings(db: Session, q: str, limit: int) -> List[dict]:
+    """Bookings whose client or dress matches, best match then most recent first"""
+    _, rank = text_search(q, [Client.full_name_normalized, Dress.name_normalized])
+    rows = db.query(
+        Booking.id, Booking.start_date, Booking.end_date, Booking.booking_status,
+        Client.full_name.label("client_name"), Dress.name.label("dress_name")
+    ).join(Client, Booking.client_id == Client.id).join(
+        Dress, Booking.dress_id == Dress.id
+    ).filter(
+        or_(
+            Booking.client_id.in_(_matching_ids(Client.full_name_normalized, q)),
+            Booking.dress_id.in_(_matching_ids(Dress.name_normalized, q))
+        )
+    ).order_by(
+        rank.desc(), Booking.start_date.desc(), Booking.id.desc()
+    ).limit(limit).all()
+    return [
+        {
+            "id": row.id,
+            "title": f"{row.dress_name} - {row.client_name}",
+            "subtitle": f"{row.start_date} to {row.end_date} ({row.booking_status})",
+            "snippet": _snippet(q, row.client_name, row.dress_name)
+        }
+        for row in rows
+    ]
+
+
+def search_sales(db: Session, q: str, limit: int) -> List[dict]:
+    """Sales whose client or item matches, best match then most recent first"""
+    _, rank = text_search(q, [Client.full_name_normalized, Clothing.name_normalized])
+    rows = db.query(
+        Sale.id, Sale.sale_date, Sale.total_price,
+        Client.full_name.label("client_name"), Clothing.name.label("item_name")
+    ).join(Client, Sale.client_id == Client.id).join(
+        Clothing, Sale.clothing_id == Clothing.id
+    ).filter(
+        or_(
+            Sale.client_id.in_(_matching_ids(Client.full_name_normalized, q)),
+            Sale.clothing_id.in_(_matching_ids(Clothing.name_normalized, q))
+        )
+    ).order_by(
+        rank.desc(), Sale.sale_date.desc(), Sale.id.desc()
+    ).limit(limit).all()
+    return [
+        {
+            "id": row.id,
+            "title": f"{row.item_name} - {row.client_name}",
+            "subtitle": f"{row.sale_date} - {row.total_price} {settings.currency}",
+            "snippet": _snippet(q, row.client_name, row.item_name)
+        }
+        for row in rows
+    ]
+
+
+SEARCHES: Dict[str, Callable[[Session, str, int], List[dict]]] = {
+    "clients": search_clients,
+    "dresses": search_dresses,
+    "clothing": search_clothing,
+    "bookings": search_bookings,
+    "sales": search_sales,
+}
+
+# One worker per entity type; bounded so a burst of searches holds at most
+# this many extra DB connections
+_executor = ThreadPoolExecutor(max_workers=len(SEARCHES), thread_name_prefix="search")
+
+
+def _run(search: Callable[[Session, str, int], List[dict]], q: str, limit: int) -> List[dict]:
+    # Sessions are not thread-safe, so every branch gets its own
+    db = SessionLocal()
+    try:
+        return search(db, q, limit)
+    finally:
+        db.close()
+
+
+def global_search(q: str, limit: int) -> dict:
+    """Top `limit` hits per entity type, queried concurrently and cached briefly"""
+    # Keyed on the exact term: phone, description and booking columns are
+    # matched as typed, so terms that only normalize alike can differ
+    key = (q, limit)
+    results = search_cache.get(key)
+    if results is None:
+        futures = {name: _executor.submit(_run, search, q, limit) for name, search in SEARCHES.items()}
+        results = {name: future.result() for name, future in futures.items()}
+        search_cache.set(key, results)
+    return {"query": q, **results}
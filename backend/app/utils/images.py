@@ -0,0 +1,42 @@
+from sqlalchemy import func, select
+from sqlalchemy.exc import InvalidRequestError
+from typing import Literal, Optional
+
+# List endpoints: "full" nests every image, "list" only the primary image
+# paths, with the gallery left unloaded (raiseload) and serialized as null
+ListView = Literal["full", "list"]
+
+
+def with_unloaded_images(schema, data):
+    """
+    Read an ORM item into a dict for `schema`, with images None when the
+    query left them unloaded, so "not loaded" is not mistaken for "no images".
+    """
+    if isinstance(data, dict):
+        return data
+    values = {name: getattr(data, name) for name in schema.model_fields if name != "images"}
+    try:
+        values["images"] = data.images
+    except InvalidRequestError:
+        values["images"] = None
+    return values
+
+
+def primary_image_path(image_model, owner_column, owner_id, variant: Optional[str] = None):
+    """
+    Correlated scalar subquery for an item's primary image path, falling back
+    to its first image. Served by the (owner id) index on the images table.
+
+    With `variant` ("thumb", "medium", "full") the WebP rendition is returned
+    instead, or the original while its variants have not been generated.
+
+    e.g. primary_image_path(DressImage, DressImage.dress_id, Dress.id)
+    """
+    column = image_model.image_path
+    if variant:
+        column = func.coalesce(image_model.variants[variant]["webp"].astext, image_model.image_path)
+    return select(column).where(
+        owner_column == owner_id
+    ).order_by(
+        image_model.is_primary.desc(), image_model.id
+    ).limit(1).correlate_except(image_model).scalar_subquery()
@@ -0,0 +1,157 @@
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import ColumnProperty, Query, Session
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal, Optional, Tuple, List
+import base64
+import json
+
+CountMode = Literal["exact", "estimate", "none"]
+
+
+def sort_column_for(model, sort_by: Optional[str], default):
+    """Resolve a sort_by query parameter to a mapped column, else the default"""
+    attr = getattr(model, sort_by, None) if sort_by else None
+    if attr is None or not isinstance(getattr(attr, "property", None), ColumnProperty):
+        return default
+    return attr
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    """Encode the sort value and id of the last row into an opaque cursor"""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps({"k": sort_key, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor for the given sort column"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["k"] != sort_column.key:
+            raise ValueError("cursor was issued for a different sort field")
+        value = payload["v"]
+        if value is not None:
+            python_type = sort_column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is Decimal:
+                value = Decimal(value)
+        return value, int(payload["id"])
+    except (ValueError, KeyError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _seek_filter(sort_column, id_column, descending: bool, value: Any, last_id: int):
+    """
+    Rows strictly after (value, last_id) in ORDER BY sort_column, id.
+    PostgreSQL sorts NULLs last for ASC and first for DESC.
+    """
+    if value is None:
+        after_nulls = id_column < last_id if descending else id_column > last_id
+        null_group = and_(sort_column.is_(None), after_nulls)
+        return or_(null_group, sort_column.isnot(None)) if descending else null_group
+
+    if descending:
+        return tuple_(sort_column, id_column) < tuple_(value, last_id)
+    return or_(
+        tuple_(sort_column, id_column) > tuple_(value, last_id),
+        sort_column.is_(None)
+    )
+
+
+def estimate_count(db: Session, query: Query) -> int:
+    """Row estimate from the planner instead of running COUNT(*)"""
+    compiled = query.statement.compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    result = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return int(result[0]["Plan"]["Plan Rows"])
+
+
+def paginate(
+    db: Session,
+    query: Query,
+    sort_column,
+    id_column,
+    sort_order: Optional[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    """
+    Paginate a filtered query by offset or, when a cursor is given, by keyset.
+
+    Results are ordered by (sort_column, id) so pages are stable. Returns the
+    page items, the total (exact, estimated or None) and a cursor for the next
+    page (None on the last page).
+    """
+    count_query = query.enable_eagerloads(False).order_by(None)
+    if count == "exact":
+        total = count_query.count()
+    elif count == "estimate":
+        total = estimate_count(db, count_query)
+    else:
+        total = None
+
+    descending = sort_order != "asc"
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_column)
+        query = query.filter(_seek_filter(sort_column, id_column, descending, value, last_id))
+    else:
+        query = query.offset(skip)
+
+    items = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(sort_column.key, getattr(last, sort_column.key), last.id)
+
+    return items, total, next_cursor
+
+
+def paginate_ranked(
+    db: Session,
+    query: Query,
+    rank,
+    id_column,
+    skip: int,
+    limit: int,
+    count: CountMode = "exact",
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    """
+    Offset-paginate a query by descending relevance (rank, then id).
+
+    Rank is computed per request, so there is no keyset cursor; the next
+    cursor is always None.
+    """
+    count_query = query.enable_eagerloads(False).order_by(None)
+    if count == "exact":
+        total = count_query.count()
+    elif count == "estimate":
+        total = estimate_count(db, count_query)
+    else:
+        total = None
+
+    items = query.order_by(rank.desc(), id_column.desc()).offset(skip).limit(limit).all()
+    return items, total, None
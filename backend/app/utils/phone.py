@@ -0,0 +1,46 @@
+from typing import Optional
+import re
+
+from ..config import get_settings
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(value: Optional[str], country_code: Optional[str] = None, partial: bool = False) -> Optional[str]:
+    """
+    Normalize a free-form phone number to E.164 (+<country code><number>).
+
+    Numbers without an international prefix are taken as national numbers of
+    the default country (Algeria, 213): "0555 12 34 56" -> "+213555123456".
+    "00" and "+" prefixes are international; a "whatsapp:" prefix is ignored.
+    Returns None when nothing that looks like a phone number remains. With
+    `partial`, a typed prefix is normalized without the length check.
+    """
+    if not value:
+        return None
+    country_code = country_code or get_settings().phone_country_code
+
+    raw = value.strip()
+    if raw.lower().startswith("whatsapp:"):
+        raw = raw[len("whatsapp:"):].strip()
+    digits = _NON_DIGITS.sub("", raw)
+    if not digits:
+        return None
+
+    if raw.startswith("+"):
+        number = digits
+    elif digits.startswith("00"):
+        number = digits[2:]
+    elif digits.startswith("0"):
+        # National trunk prefix
+        number = country_code + digits[1:]
+    elif digits.startswith(country_code) and len(digits) >= len(country_code) + 8:
+        # International number typed without the +
+        number = digits
+    else:
+        number = country_code + digits
+
+    # E.164 allows at most 15 digits; anything this short is not dialable
+    if len(number) > 15 or (len(number) < 8 and not partial):
+        return None
+    return f"+{number}"
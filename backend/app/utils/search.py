@@ -0,0 +1,37 @@
+from sqlalchemy import func, or_
+from typing import Literal, Sequence
+
+from .text import normalize_text
+
+MatchMode = Literal["contains", "prefix", "fuzzy"]
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _matches(column, term: str, match: MatchMode):
+    if match == "fuzzy":
+        # column %> term is word_similarity(term, column) above pg_trgm's threshold
+        return column.op("%>")(term)
+    pattern = f"{escape_like(term)}%" if match == "prefix" else f"%{escape_like(term)}%"
+    return column.ilike(pattern, escape="\\")
+
+
+def text_search(term: str, normalized_columns: Sequence, raw_columns: Sequence = (), match: MatchMode = "contains"):
+    """
+    Filter and relevance rank for `term`, served by pg_trgm GIN indexes.
+
+    Normalized shadow columns are compared with the normalized term (see
+    normalize_text); raw columns such as phone numbers with the term as typed.
+    Matching is ILIKE for contains/prefix and word similarity for fuzzy; the
+    rank is the best trigram word similarity across all columns.
+    """
+    targets = [(column, normalize_text(term)) for column in normalized_columns]
+    targets += [(column, term) for column in raw_columns]
+
+    clause = or_(*[_matches(column, value, match) for column, value in targets])
+    scores = [func.coalesce(func.word_similarity(value, column), 0) for column, value in targets]
+    rank = func.greatest(*scores) if len(scores) > 1 else scores[0]
+    return clause, rank
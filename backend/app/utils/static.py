@@ -0,0 +1,40 @@
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from urllib.parse import quote
+import os
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# objects/ files are named by the SHA-256 of their bytes and never change
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Other uploads get a fresh uuid name per upload but may still be removed
+REVALIDATE = "public, max-age=86400"
+
+
+class UploadStaticFiles(StaticFiles):
+    """
+    /uploads with cache headers. With uploads_accel_redirect the app only
+    resolves the path (404s and traversal are still handled here) and nginx
+    sends the bytes from the internal uploads_accel_prefix location, adding
+    its own ETag and Last-Modified and keeping our Cache-Control.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        path = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+        immutable = path.startswith("objects/")
+        headers = {"Cache-Control": IMMUTABLE if immutable else REVALIDATE}
+
+        if settings.uploads_accel_redirect:
+            headers["X-Accel-Redirect"] = settings.uploads_accel_prefix + quote(path)
+            return Response(status_code=status_code, headers=headers)
+
+        if immutable:
+            # The digest in the name is already a strong validator
+            headers["ETag"] = f'"{os.path.basename(path)}"'
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,76 @@
+from typing import Optional
+import html
+import re
+import unicodedata
+
+# Letters that NFKD leaves alone but staff type interchangeably
+_FOLD = str.maketrans({
+    "ـ": None,      # tatweel
+    "ٱ": "ا",  # alef wasla -> alef
+    "ى": "ي",  # alef maqsura -> yeh
+    "ة": "ه",  # teh marbuta -> heh
+    "ی": "ي",  # farsi yeh -> yeh
+    "ک": "ك",  # keheh -> kaf
+    "œ": "oe",
+    "æ": "ae",
+    **{chr(0x0660 + d): str(d) for d in range(10)},  # Arabic-Indic digits
+    **{chr(0x06f0 + d): str(d) for d in range(10)},  # Extended Arabic-Indic digits
+})
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    """
+    Fold a name for search: French accents, Arabic diacritics, hamza/madda
+    on alef, waw and yeh, tatweel, letter variants and case.
+
+    NFKD splits accented Latin letters and hamza/madda carriers into a base
+    letter plus combining marks, which are dropped along with harakat.
+    """
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", stripped.casefold().translate(_FOLD)).strip()
+
+
+def _fold_char(ch: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", ch)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " " if stripped.isspace() else stripped.casefold().translate(_FOLD)
+
+
+def highlight(value: Optional[str], term: str, context: int = 30) -> Optional[str]:
+    """
+    Snippet of `value` around the first match of `term`, compared the way
+    normalize_text compares them, with the match wrapped in <mark></mark>.
+    Text outside the mark is HTML-escaped. None when the term does not occur.
+    """
+    needle = normalize_text(term)
+    if not value or not needle:
+        return None
+
+    # Fold character by character, remembering where each folded char came from
+    folded, origin = [], []
+    for i, ch in enumerate(value):
+        piece = _fold_char(ch)
+        if piece == " " and folded and folded[-1] == " ":
+            continue
+        folded.append(piece)
+        origin.extend([i] * len(piece))
+    position = "".join(folded).find(needle)
+    if position < 0:
+        return None
+
+    start = origin[position]
+    end = origin[position + len(needle) - 1] + 1
+    left = max(0, start - context)
+    right = min(len(value), end + context)
+    return (
+        ("…" if left > 0 else "")
+        + html.escape(value[left:start])
+        + "<mark>" + html.escape(value[start:end]) + "</mark>"
+        + html.escape(value[end:right])
+        + ("…" if right < len(value) else "")
+    )
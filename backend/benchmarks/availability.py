@@ -0,0 +1,85 @@
+"""
+Latency benchmark for GET /api/dresses/available
+
+Seeds synthetic bookings, then times the availability anti-join for a few
+windows by calling the route handler directly, and prints the query plan so
+the bookings_no_overlap GiST index can be seen backing the NOT EXISTS.
+Target: well under 50 ms per call.
+
+Run from backend/ against a migrated scratch database:
+    DATABASE_URL=postgresql://... python benchmarks/availability.py --seed 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+from app.database import SessionLocal
+from app.routers import dresses
+from seed import seed_bookings
+
+WINDOWS = [
+    (date(2016, 6, 1), 3, 0),
+    (date(2020, 1, 10), 7, 2),
+    (date(2024, 9, 1), 30, 0),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic bookings first")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            print(f"Seeding {args.seed} bookings...")
+            seed_bookings(db, args.seed)
+
+        print(f"{'window':>26} {'buffer':>7} {'found':>6} {'best ms':>9}")
+        for start, length, buffer_days in WINDOWS:
+            end = start + timedelta(days=length)
+            best = float("inf")
+            for _ in range(args.repeat):
+                began = time.perf_counter()
+                result = dresses.get_available_dresses(
+                    start=start, end=end, size=None, category=None,
+                    buffer_days=buffer_days, limit=100, db=db, current_user=None
+                )
+                best = min(best, time.perf_counter() - began)
+                db.expunge_all()
+            print(f"{f'{start} .. {end}':>26} {buffer_days:>7} {result['total']:>6} {best * 1000:>9.2f}")
+
+        # Capture the SQL the handler issues and show its plan
+        captured = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not captured:
+                captured.append(cursor.mogrify(statement, parameters).decode())
+
+        event.listen(db.get_bind(), "before_cursor_execute", before_cursor_execute)
+        try:
+            start, length, buffer_days = WINDOWS[0]
+            dresses.get_available_dresses(
+                start=start, end=start + timedelta(days=length), size=None, category=None,
+                buffer_days=buffer_days, limit=100, db=db, current_user=None
+            )
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", before_cursor_execute)
+
+        print()
+        for (line,) in db.execute(text("EXPLAIN ANALYZE " + captured[0])):
+            print(line)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Concurrency benchmark for the Wardrop API
+
+Measures latency of interactive endpoints while the heavy report/export
+endpoints run in parallel. With handlers dispatched to the threadpool the
+interactive p50/p95 under load should stay close to the idle baseline.
+
+Run (against a running server):
+    WARDROP_EMAIL=admin@example.com WARDROP_PASSWORD=secret \
+        python benchmarks/concurrency.py --base-url http://localhost:8000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+INTERACTIVE_ENDPOINTS = [
+    "/api/clients/?limit=20",
+    "/api/dresses/?limit=20",
+    "/api/bookings/?limit=20",
+    "/api/sales/?limit=20",
+    "/api/settings/",
+]
+
+HEAVY_ENDPOINTS = [
+    "/api/reports/earnings?period=daily",
+    "/api/export/commercial-report",
+]
+
+
+def login(base_url: str, email: str, password: str) -> str:
+    data = urllib.parse.urlencode({"username": email, "password": password}).encode()
+    req = urllib.request.Request(f"{base_url}/api/auth/login", data=data)
+    with urllib.request.urlopen(req) as resp:
+        return json.loads(resp.read())["access_token"]
+
+
+def timed_get(base_url: str, path: str, token: str) -> float:
+    req = urllib.request.Request(
+        f"{base_url}{path}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(req) as resp:
+        resp.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_interactive(base_url: str, token: str, rounds: int, workers: int) -> list:
+    paths = INTERACTIVE_ENDPOINTS * rounds
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda p: timed_get(base_url, p, token), paths))
+
+
+def heavy_load(base_url: str, token: str, stop: threading.Event, timings: list):
+    while not stop.is_set():
+        for path in HEAVY_ENDPOINTS:
+            timings.append(timed_get(base_url, path, token))
+
+
+def summarize(label: str, samples: list):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if samples else 0
+    print(
+        f"{label:<28} n={len(samples):<5} "
+        f"p50={statistics.median(samples):8.1f} ms  "
+        f"p95={p95:8.1f} ms  max={samples[-1]:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--heavy-clients", type=int, default=4)
+    args = parser.parse_args()
+
+    token = login(args.base_url, os.environ["WARDROP_EMAIL"], os.environ["WARDROP_PASSWORD"])
+
+    # Warm up connections and caches
+    measure_interactive(args.base_url, token, 1, args.workers)
+
+    baseline = measure_interactive(args.base_url, token, args.rounds, args.workers)
+
+    stop = threading.Event()
+    heavy_timings = []
+    heavy_threads = [
+        threading.Thread(target=heavy_load, args=(args.base_url, token, stop, heavy_timings))
+        for _ in range(args.heavy_clients)
+    ]
+    for t in heavy_threads:
+        t.start()
+    time.sleep(0.5)
+
+    try:
+        under_load = measure_interactive(args.base_url, token, args.rounds, args.workers)
+    finally:
+        stop.set()
+        for t in heavy_threads:
+            t.join()
+
+    summarize("interactive (idle)", baseline)
+    summarize("interactive (under load)", under_load)
+    summarize("reports/export", heavy_timings)
+
+
+if __name__ == "__main__":
+    main()
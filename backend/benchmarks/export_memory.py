@@ -0,0 +1,61 @@
+"""
+Memory and wall-time benchmark for the bookings Excel export
+
+Runs ExcelService.export_bookings in-process and reports peak RSS and the
+size of the produced file. With the write-only workbook and a server-side
+cursor, peak RSS should stay roughly flat as the number of bookings grows.
+
+Run from backend/ against a scratch database:
+    DATABASE_URL=postgresql://... python benchmarks/export_memory.py --seed 500000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.booking import Booking
+from app.services.excel import ExcelService
+from seed import seed_bookings
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic bookings first")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            print(f"Seeding {args.seed} bookings...")
+            seed_bookings(db, args.seed)
+
+        total = db.query(Booking).count()
+        rss_before = peak_rss_mb()
+
+        start = time.perf_counter()
+        output = ExcelService(db).export_bookings()
+        size = output.seek(0, os.SEEK_END)
+        output.close()
+        elapsed = time.perf_counter() - start
+
+        print(f"bookings:        {total}")
+        print(f"wall time:       {elapsed:.1f} s")
+        print(f"xlsx size:       {size / 1024 / 1024:.1f} MB")
+        print(f"peak RSS before: {rss_before:.1f} MB")
+        print(f"peak RSS after:  {peak_rss_mb():.1f} MB")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
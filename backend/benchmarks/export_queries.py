@@ -0,0 +1,85 @@
+"""
+Query-count and wall-time comparison for booking and sales exports
+
+Compares the old per-row relationship access (lazy loads for client, dress
+and clothing names) against the flat joined projections ExcelService uses
+now, at 10k and 100k rows. The projection path issues one query per sheet
+regardless of size.
+
+Run from backend/ against a scratch (empty) database:
+    DATABASE_URL=postgresql://... python benchmarks/export_queries.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.models.booking import Booking
+from app.models.sale import Sale
+from app.services.excel import ExcelService, EXPORT_BATCH_SIZE
+from seed import seed_bookings, seed_sales
+
+SIZES = [10_000, 100_000]
+
+
+def legacy_bookings(db):
+    for booking in db.query(Booking).yield_per(EXPORT_BATCH_SIZE):
+        booking.client.full_name if booking.client else ""
+        booking.dress.name if booking.dress else ""
+
+
+def legacy_sales(db):
+    for sale in db.query(Sale).yield_per(EXPORT_BATCH_SIZE):
+        sale.client.full_name if sale.client else ""
+        sale.clothing.name if sale.clothing else ""
+
+
+def measure(fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        result = fn(db)
+        if hasattr(result, "close"):
+            result.close()
+        return len(statements), time.perf_counter() - start
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def main():
+    cases = [
+        ("bookings (lazy loads)", legacy_bookings),
+        ("bookings (projection)", lambda db: ExcelService(db).export_bookings()),
+        ("sales (lazy loads)", legacy_sales),
+        ("sales (projection)", lambda db: ExcelService(db).export_sales()),
+    ]
+
+    db = SessionLocal()
+    seeded = 0
+    try:
+        print(f"{'rows':>8}  {'case':<24} {'queries':>8} {'seconds':>8}")
+        for size in SIZES:
+            seed_bookings(db, size - seeded)
+            seed_sales(db, size - seeded)
+            seeded = size
+            for label, fn in cases:
+                queries, seconds = measure(fn)
+                print(f"{size:>8}  {label:<24} {queries:>8} {seconds:>8.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
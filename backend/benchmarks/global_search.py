@@ -0,0 +1,48 @@
+"""
+Latency benchmark for GET /api/search
+
+Types a query one keystroke at a time against global_search and reports the
+latency of each prefix cold (cache cleared) and warm (served from the LRU).
+Each keystroke should stay under 100 ms cold.
+
+Run from backend/ against a migrated database:
+    DATABASE_URL=postgresql://... python benchmarks/global_search.py --query "Bench Client 42"
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.search import global_search, search_cache
+
+
+def timed(q: str, limit: int):
+    start = time.perf_counter()
+    result = global_search(q, limit)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", default="Bench Client 42")
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    # Warm up the connection pool and executor threads
+    global_search(args.query, args.limit)
+
+    print(f"{'prefix':<24} {'cold ms':>9} {'warm ms':>9} {'hits':>6}")
+    for end in range(2, len(args.query) + 1):
+        prefix = args.query[:end]
+        search_cache.clear()
+        cold, result = timed(prefix, args.limit)
+        warm, _ = timed(prefix, args.limit)
+        hits = sum(len(result[name]) for name in ("clients", "dresses", "clothing", "bookings", "sales"))
+        print(f"{prefix:<24} {cold:>9.2f} {warm:>9.2f} {hits:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Bulk client import benchmark
+
+Generates a client sheet in the import format (100k rows by default),
+imports it through ExcelService.import_clients inside a transaction that is
+rolled back, and reports wall time and peak RSS.
+
+Run from backend/ against a migrated database:
+    DATABASE_URL=postgresql://... python benchmarks/import_clients.py --rows 100000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.services.excel import ExcelService
+
+
+def build_sheet(rows: int):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Clients")
+    ws.append(["ID", "Full Name", "Phone", "WhatsApp", "Address", "Notes"])
+    for i in range(1, rows + 1):
+        phone = f"05{i:08d}"
+        ws.append([i, f"Import Client {i}", phone, phone, f"{i} Rue des Martyrs, Alger", ""])
+    output = tempfile.TemporaryFile()
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sheet = build_sheet(args.rows)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        start = time.perf_counter()
+        result = ExcelService(db).import_clients(sheet)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+        sheet.close()
+
+    print(f"rows imported:   {result['imported']} ({len(result['errors'])} errors)")
+    print(f"wall time:       {elapsed:.1f} s")
+    print(f"peak RSS before: {rss_before:.1f} MB")
+    print(f"peak RSS after:  {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Before/after query plans for the migration 008 filter indexes
+
+For each endpoint query shape, prints the plan and execution time with the
+008 indexes present, then drops them inside a transaction that is rolled
+back and prints the plan again. Seqscans and sorts in the "before" plans
+should turn into index scans "after".
+
+Run from backend/ against a migrated scratch database (DROP INDEX takes an
+exclusive lock until the rollback):
+    DATABASE_URL=postgresql://... python benchmarks/index_plans.py --seed 1000000
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.database import engine, SessionLocal
+from seed import seed_bookings, seed_sales
+
+MIGRATION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions", "008_filter_indexes.py")
+
+# Endpoint -> representative SQL, using ids/dates that exist after seeding
+QUERIES = {
+    "GET /bookings?client_id=": """
+        SELECT * FROM bookings WHERE client_id = (SELECT min(id) FROM clients)
+        ORDER BY start_date DESC, id DESC LIMIT 50
+    """,
+    "GET /bookings?dress_id=": """
+        SELECT * FROM bookings WHERE dress_id = (SELECT max(id) FROM dresses)
+        ORDER BY start_date DESC, id DESC LIMIT 50
+    """,
+    "GET /bookings?status=confirmed": """
+        SELECT * FROM bookings WHERE booking_status = 'confirmed'
+        ORDER BY start_date DESC, id DESC LIMIT 50
+    """,
+    "GET /bookings?deposit_status=pending": """
+        SELECT * FROM bookings WHERE deposit_status = 'pending'
+        ORDER BY start_date DESC, id DESC LIMIT 50
+    """,
+    "scheduler confirmed -> in_progress": """
+        SELECT id, dress_id FROM bookings
+        WHERE booking_status = 'confirmed' AND start_date <= CURRENT_DATE
+    """,
+    "scheduler in_progress -> completed": """
+        SELECT id, dress_id FROM bookings
+        WHERE booking_status = 'in_progress' AND end_date < CURRENT_DATE
+    """,
+    "dashboard upcoming returns": """
+        SELECT count(*) FROM bookings
+        WHERE booking_status = 'in_progress'
+          AND end_date BETWEEN CURRENT_DATE AND CURRENT_DATE + 7
+    """,
+    "GET /sales?client_id=": """
+        SELECT * FROM sales WHERE client_id = (SELECT min(id) FROM clients)
+        ORDER BY sale_date DESC, id DESC LIMIT 50
+    """,
+    "GET /sales?clothing_id=": """
+        SELECT * FROM sales WHERE clothing_id = (SELECT max(id) FROM clothing)
+        ORDER BY sale_date DESC, id DESC LIMIT 50
+    """,
+    "GET /dresses (images)": """
+        SELECT * FROM dress_images WHERE dress_id IN (SELECT id FROM dresses ORDER BY id LIMIT 50)
+    """,
+    "GET /clothing (images)": """
+        SELECT * FROM clothing_images WHERE clothing_id IN (SELECT id FROM clothing ORDER BY id LIMIT 50)
+    """,
+    "GET /notifications/logs?client_id=": """
+        SELECT * FROM notification_logs WHERE client_id = (SELECT min(id) FROM clients)
+        ORDER BY sent_at DESC, id DESC LIMIT 50
+    """,
+}
+
+
+def load_indexes():
+    spec = importlib.util.spec_from_file_location("migration_008", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.INDEXES
+
+
+def explain(connection, sql: str) -> list:
+    rows = connection.execute(text("EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF, SUMMARY ON) " + sql))
+    return [line for (line,) in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic bookings and sales first")
+    args = parser.parse_args()
+
+    if args.seed:
+        db = SessionLocal()
+        try:
+            print(f"Seeding {args.seed} bookings and sales...")
+            seed_bookings(db, args.seed)
+            seed_sales(db, args.seed)
+        finally:
+            db.close()
+
+    indexes = load_indexes()
+    with engine.connect() as connection:
+        after = {name: explain(connection, sql) for name, sql in QUERIES.items()}
+
+        transaction = connection.begin()
+        try:
+            for index_name, _, _ in indexes:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            before = {name: explain(connection, sql) for name, sql in QUERIES.items()}
+        finally:
+            transaction.rollback()
+
+    for name in QUERIES:
+        print(f"=== {name}")
+        print("--- before")
+        print("\n".join(before[name]))
+        print("--- after")
+        print("\n".join(after[name]))
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Offset vs keyset pagination benchmark for the bookings list
+
+Seeds synthetic bookings (1M by default) into the configured database, then
+times fetching page N with OFFSET and with a next_cursor seek. Offset latency
+grows with N; keyset latency should stay flat.
+
+Run from backend/ against a scratch database:
+    DATABASE_URL=postgresql://... python benchmarks/pagination.py --seed 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.booking import Booking
+from app.utils.pagination import encode_cursor, paginate
+from seed import seed_bookings
+
+PAGES = [1, 10, 100, 1000, 5000, 10000]
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic bookings first")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            print(f"Seeding {args.seed} bookings...")
+            seed_bookings(db, args.seed)
+
+        total = db.query(Booking).count()
+        print(f"bookings: {total}\n")
+        print(f"{'page':>8} {'offset ms':>12} {'cursor ms':>12}")
+
+        base = db.query(Booking)
+        for page in PAGES:
+            skip = (page - 1) * args.limit
+            if skip >= total:
+                break
+
+            offset_ms = timed(lambda: paginate(
+                db, base, Booking.start_date, Booking.id, "desc", skip, args.limit, count="none"
+            ))
+
+            # Cursor pointing at the last row of the previous page
+            cursor = None
+            if skip:
+                last = base.order_by(Booking.start_date.desc(), Booking.id.desc()).offset(skip - 1).first()
+                cursor = encode_cursor("start_date", last.start_date, last.id)
+
+            cursor_ms = timed(lambda: paginate(
+                db, base, Booking.start_date, Booking.id, "desc", 0, args.limit, cursor, count="none"
+            ))
+            db.expunge_all()
+
+            print(f"{page:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Query-count budget checks for report endpoints
+
+Seeds rows inside a transaction that is rolled back at the end, calls the
+route handlers directly and asserts how many SQL statements each one
+issues. Budgets must not depend on the number of rows involved.
+
+Run from backend/ against a migrated database:
+    DATABASE_URL=postgresql://... python benchmarks/query_counts.py
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.routers import reports
+
+
+@contextmanager
+def count_queries(connection):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def seed_buyers(db: Session, count: int):
+    """Clients who bought clothing but never rented"""
+    db.execute(text("""
+        INSERT INTO clothing (name, name_normalized, category, size, color, sale_price, stock_quantity)
+        VALUES ('Query Budget Item', 'query budget item', 'Other', 'M', 'Black', 1000, 0)
+    """))
+    db.execute(text("""
+        WITH new_clients AS (
+            INSERT INTO clients (full_name, full_name_normalized)
+            SELECT 'Query Budget Buyer ' || g, 'query budget buyer ' || g FROM generate_series(1, :count) g
+            RETURNING id
+        )
+        INSERT INTO sales (client_id, clothing_id, quantity, unit_price, total_price, sale_date)
+        SELECT id, (SELECT max(id) FROM clothing), 1, 1000, 1000, CURRENT_DATE
+        FROM new_clients
+    """), {"count": count})
+    db.flush()
+
+
+def check_top_clients(db: Session, connection) -> int:
+    with count_queries(connection) as statements:
+        reports.get_top_clients(limit=10, start_date=None, end_date=date.today(), db=db, current_user=None)
+    return len(statements)
+
+
+def main():
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection)
+    try:
+        results = []
+        for buyers in (10, 1000):
+            seed_buyers(db, buyers)
+            results.append((buyers, check_top_clients(db, connection)))
+
+        for buyers, count in results:
+            print(f"top-clients with +{buyers:>5} buyer-only clients: {count} queries")
+
+        assert all(count == 1 for _, count in results), "top-clients must run a single statement"
+        print("OK")
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
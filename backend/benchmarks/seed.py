@@ -0,0 +1,51 @@
+"""Synthetic data helpers shared by the benchmark scripts"""
+
+from sqlalchemy import text
+
+
+def seed_bookings(db, count: int):
+    """Insert synthetic clients, dresses and `count` bookings (1M spans ~11 years)"""
+    db.execute(text("""
+        INSERT INTO clients (full_name, full_name_normalized, phone)
+        SELECT 'Bench Client ' || g, 'bench client ' || g, '0555' || lpad(g::text, 6, '0')
+        FROM generate_series(1, 1000) g
+    """))
+    db.execute(text("""
+        INSERT INTO dresses (name, name_normalized, category, size, color, rental_price, deposit_amount, status)
+        SELECT 'Bench Dress ' || g, 'bench dress ' || g, 'Wedding', 'M', 'White', 15000, 5000, 'available'
+        FROM generate_series(1, 1000) g
+    """))
+    # Each dress gets back-to-back 4-day bookings so none overlap (bookings_no_overlap)
+    db.execute(text("""
+        INSERT INTO bookings (client_id, dress_id, start_date, end_date, rental_price,
+                              deposit_amount, deposit_status, booking_status)
+        SELECT
+            (SELECT min(id) FROM clients) + (g % 1000),
+            (SELECT max(id) - 999 FROM dresses) + (g % 1000),
+            DATE '2015-01-01' + (g / 1000) * 4,
+            DATE '2015-01-01' + (g / 1000) * 4 + 3,
+            10000 + (g % 50) * 500, 5000, 'paid', 'completed'
+        FROM generate_series(1, :count) g
+    """), {"count": count})
+    db.commit()
+    db.execute(text("ANALYZE bookings"))
+
+
+def seed_sales(db, count: int):
+    """Insert synthetic clothing items and `count` sales to existing clients"""
+    db.execute(text("""
+        INSERT INTO clothing (name, name_normalized, category, size, color, purchase_price, sale_price, stock_quantity)
+        SELECT 'Bench Item ' || g, 'bench item ' || g, 'Accessories', 'M', 'Black', 1500, 3000, 100
+        FROM generate_series(1, 200) g
+    """))
+    db.execute(text("""
+        INSERT INTO sales (client_id, clothing_id, quantity, unit_price, total_price, sale_date)
+        SELECT
+            (SELECT min(id) FROM clients) + (g % (SELECT count(*) FROM clients)),
+            (SELECT min(id) FROM clothing) + (g % 200),
+            1 + (g % 3), 3000, 3000 * (1 + (g % 3)),
+            DATE '2015-01-01' + (g % 4000)
+        FROM generate_series(1, :count) g
+    """), {"count": count})
+    db.commit()
+    db.execute(text("ANALYZE sales"))